@@ -0,0 +1,100 @@
+#!/usr/bin/python
+"""Benchmark of the dictionary and record paths between the reader and LogParser.
+
+The baseline path processes each dictionary with process_log, as
+process_logs did before the record path was added.
+
+Usage: python bench/bench_records.py [N_LINES]
+"""
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from log_parser import LOG_RECORD_FIELDS, LogParser  # noqa: E402
+from main import DEFAULT_LOG_LINE_FORMAT, to_process_log  # noqa: E402
+from mem_profile import generate_log_lines, profile_stage  # noqa: E402
+from utils import compile_unformat, unformat  # noqa: E402
+
+# Constants
+DEFAULT_N_LINES = 200_000
+
+
+def baseline_path(lines):
+    """Parse the lines into dictionaries and process them one at a time."""
+    logs = (unformat(line, DEFAULT_LOG_LINE_FORMAT) for line in lines)
+    log_parser = LogParser()
+    for log in logs:
+        if to_process_log(log):
+            log_parser.process_log(log)
+    return log_parser
+
+
+def dict_path(lines):
+    """Parse the lines into dictionaries and process them with process_logs."""
+    logs = (unformat(line, DEFAULT_LOG_LINE_FORMAT) for line in lines)
+    log_parser = LogParser()
+    log_parser.process_logs(log for log in logs if to_process_log(log))
+    return log_parser
+
+
+def record_path(lines):
+    """Parse the lines into records and process them with process_records."""
+    unformat_record = compile_unformat(DEFAULT_LOG_LINE_FORMAT, LOG_RECORD_FIELDS)
+    records = map(unformat_record, lines)
+    log_parser = LogParser()
+    log_parser.process_records(record for record in records if record is not None)
+    return log_parser
+
+
+def process_one_at_a_time(log_parser, logs):
+    """Process parsed log entries with process_log, as the baseline process_logs."""
+    for log in logs:
+        log_parser.process_log(log)
+
+
+def main(argv):
+    n_lines = int(argv[1]) if len(argv) > 1 else DEFAULT_N_LINES
+    lines = list(generate_log_lines(n_lines))
+
+    print(f"Processing {n_lines} lines:")
+    results = []
+    paths = (("baseline", baseline_path), ("dict", dict_path), ("record", record_path))
+    for name, path in paths:
+        start = perf_counter()
+        results.append(path(lines).to_dict())
+        elapsed = perf_counter() - start
+        print(f"  {name}: {elapsed:.3f}s ({n_lines / elapsed:,.0f} lines/s)")
+    assert results[0] == results[1] == results[2]
+
+    logs = [unformat(line, DEFAULT_LOG_LINE_FORMAT) for line in lines]
+    records = [tuple(log[field] for field in LOG_RECORD_FIELDS) for log in logs]
+    processors = {
+        "baseline": lambda log_parser: process_one_at_a_time(log_parser, logs),
+        "dict": lambda log_parser: log_parser.process_logs(logs),
+        "record": lambda log_parser: log_parser.process_records(records),
+    }
+
+    print(f"Processing {n_lines} parsed entries:")
+    for name, process in processors.items():
+        log_parser = LogParser()
+        start = perf_counter()
+        process(log_parser)
+        elapsed = perf_counter() - start
+        print(f"  {name}: {elapsed:.3f}s ({n_lines / elapsed:,.0f} entries/s)")
+
+    unformat_record = compile_unformat(DEFAULT_LOG_LINE_FORMAT, LOG_RECORD_FIELDS)
+    stages = {
+        "dict": (unformat(line, DEFAULT_LOG_LINE_FORMAT) for line in lines[:10_000]),
+        "record": map(unformat_record, lines[:10_000]),
+    }
+
+    print("Bytes allocated per parsed line:")
+    for name, stage in stages.items():
+        print(f"  {name}: {profile_stage(stage)['bytes_per_entry']:.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+"""Benchmark of the rendering of a report with many charms.
+
+Usage: python bench/bench_render.py [N_CHARMS]
+"""
+
+import os
+import sys
+from io import StringIO
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from log_parser import INITIAL_BASE_STATS, LogParser  # noqa: E402
+from report_renderers import RENDERERS  # noqa: E402
+
+# Constants
+DEFAULT_N_CHARMS = 100_000
+
+
+def new_log_parser(n_charms: int) -> LogParser:
+    """Create a LogParser holding the statistics of n_charms charms."""
+    stats_per_charm = {}
+    for i in range(n_charms):
+        all_stats = {severity: i % 97 for severity in INITIAL_BASE_STATS}
+        dup_stats = {severity: i % 13 for severity in INITIAL_BASE_STATS}
+        stats_per_charm[f"juju.charm-{i}"] = {"all": all_stats, "duplicates": dup_stats}
+
+    return LogParser.from_dict(
+        {"global": LogParser().get_global_stats(), "per_charm": stats_per_charm}
+    )
+
+
+def concatenated_str(log_parser: LogParser) -> str:
+    """Render the text report with the former repeated concatenation."""
+
+    def single_stats_to_str(title, stats, padding=0, tab_space=2):
+        tab = " " * padding * tab_space
+        txt = f"{tab}{title}:\n"
+        all_total = 0
+        dup_total = 0
+        for severity in stats["all"]:
+            tab = " " * (padding + 1) * tab_space
+            all_value = stats["all"][severity]
+            dup_value = stats["duplicates"][severity]
+            all_total += all_value
+            dup_total += dup_value
+            dup_str = f" ({dup_value} duplicates)" if dup_value > 0 else ""
+            txt += f"{tab}{severity}: {all_value}{dup_str}\n"
+        dup_str = f" ({dup_total} duplicates)" if dup_total > 0 else ""
+        txt += f"{tab}TOTAL: {all_total}{dup_str}\n"
+        return txt
+
+    txt = single_stats_to_str("Global", log_parser.get_global_stats())
+    txt += "\nPer Charm:\n"
+    for charm_name, charm_stats in log_parser.get_stats_per_charm().items():
+        txt += single_stats_to_str(charm_name, charm_stats, 1)
+    return txt
+
+
+def timed(function, *args) -> float:
+    """Run a function and return the elapsed time in seconds."""
+    start = perf_counter()
+    function(*args)
+    return perf_counter() - start
+
+
+def main(argv):
+    n_charms = int(argv[1]) if len(argv) > 1 else DEFAULT_N_CHARMS
+    log_parser = new_log_parser(n_charms)
+
+    out = StringIO()
+    RENDERERS["text"](log_parser, out)
+    assert out.getvalue() == concatenated_str(log_parser) + "\n"
+
+    print(f"Rendering a report with {n_charms} charms:")
+    print(f"  concatenated str: {timed(concatenated_str, log_parser):.3f}s")
+    with open(os.devnull, mode="w") as devnull:
+        for report_format, renderer in RENDERERS.items():
+            elapsed = timed(renderer, log_parser, devnull)
+            print(f"  {report_format}: {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
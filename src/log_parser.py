@@ -5,12 +5,18 @@ This script contains a class named LogParser that processes logs
 and extracts some statistics.
 """
 
+from io import StringIO
 from operator import itemgetter
-from typing import Dict, Iterable, Set
+from typing import Any, Dict, Iterable, Iterator, Set, TextIO, Tuple
 
 # Constants
 INITIAL_BASE_STATS = {"INFO": 0, "DEBUG": 0, "WARNING": 0, "ERROR": 0}
 
+# Fields of a log entry carried by a LogRecord, in order
+LOG_RECORD_FIELDS = ["charm_name", "severity_level", "message"]
+
+LogRecord = Tuple[str, str, str]
+
 DEFAULT_TAB_SPACE = 2
 
 
@@ -56,6 +62,16 @@ class LogParser:
         """
         return self.stats_per_charm.get(charm_name)
 
+    def get_stats_per_charm(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """
+        Get the statistics calculated for every charm.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, str]]]: statistics calculated
+                for each charm, by order of appearance
+        """
+        return self.stats_per_charm
+
     def get_processed_messages(self) -> Set[str]:
         """
         Get the set of ids of the processed messages.
@@ -65,6 +81,45 @@ class LogParser:
         """
         return self.processed_messages
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Export the gathered statistics into a serializable dictionary.
+
+        The set of processed messages is not exported, as it is only
+        required to detect duplicates while processing new logs.
+
+        Returns:
+            Dict[str, Any]: dictionary with the global and per charm statistics
+        """
+        return {"global": self.global_stats, "per_charm": self.stats_per_charm}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "LogParser":
+        """
+        Create a new LogParser object from statistics exported by to_dict.
+
+        Args:
+            state (Dict[str, Any]): dictionary created by to_dict
+
+        Raises:
+            TypeError: state is not a Dict[str, Any]
+
+        Returns:
+            LogParser: LogParser object holding the imported statistics
+        """
+        if state is None or not isinstance(state, dict):
+            raise TypeError("state is not a Dict[str, Any]")
+
+        log_parser = cls()
+        log_parser.global_stats = {
+            kind: dict(counters) for kind, counters in state["global"].items()
+        }
+        log_parser.stats_per_charm = {
+            charm_name: {kind: dict(counters) for kind, counters in stats.items()}
+            for charm_name, stats in state["per_charm"].items()
+        }
+        return log_parser
+
     @staticmethod
     def __update_single_stats(
         stats: Dict[str, Dict[str, str]], severity_level: str, is_duplicate: bool
@@ -127,72 +182,136 @@ class LogParser:
             self.stats_per_charm[charm_name], severity_level, is_duplicate
         )
 
+    @staticmethod
+    def __logs_to_records(logs: Iterable[Dict[str, str]]) -> Iterator[LogRecord]:
+        """Produce the log record of each parsed log entry.
+
+        Args:
+            logs (Iterable[Dict[str, str]]): parsed log entries
+
+        Raises:
+            TypeError: log is not a Dict[str, str]
+        """
+        get_record = itemgetter(*LOG_RECORD_FIELDS)
+
+        for log in logs:
+            if log is None or not isinstance(log, dict):
+                raise TypeError("log is not a Dict[str, str]")
+            yield get_record(log)
+
     def process_logs(self, logs: Iterable[Dict[str, str]]):
         """Process a batch of parsed log entries.
 
         Args:
             logs (Iterable[Dict[str, str]]): Batch of parsed logs to process
         """
-        for log in logs:
-            self.process_log(log)
+        self.process_records(LogParser.__logs_to_records(logs))
+
+    def process_records(self, records: Iterable[LogRecord]):
+        """Process a batch of log records.
+
+        Records only carry the fields used to gather the statistics, which
+        avoids creating a dictionary for each log entry.
+
+        Args:
+            records (Iterable[LogRecord]): Batch of
+                (charm name, severity level, message) tuples to process
+        """
+        get_message_id = LogParser.__get_message_id
+        processed_messages = self.processed_messages
+        global_all = self.global_stats["all"]
+        global_duplicates = self.global_stats["duplicates"]
+        stats_per_charm = self.stats_per_charm
+
+        for charm_name, severity_level, message in records:
+            message_id = get_message_id(charm_name, severity_level, message)
+            is_duplicate = message_id in processed_messages
+
+            if not is_duplicate:
+                processed_messages.add(message_id)
+
+            # Update global statistics
+            global_all[severity_level] += 1
+            if is_duplicate:
+                global_duplicates[severity_level] += 1
+
+            # Create empty statistics for the charm if they don't exist
+            charm_stats = stats_per_charm.get(charm_name)
+            if charm_stats is None:
+                charm_stats = stats_per_charm[charm_name] = LogParser.__new_stats()
+
+            # Update charm's statistics
+            charm_stats["all"][severity_level] += 1
+            if is_duplicate:
+                charm_stats["duplicates"][severity_level] += 1
 
     @staticmethod
-    def __single_stats_to_str(
+    def __write_single_stats(
+        out: TextIO,
         title: str,
         stats: Dict[str, Dict[str, str]],
         padding: int = 0,
         tab_space: int = DEFAULT_TAB_SPACE,
     ):
-        """Create string representation for a single statistics dictionary.
+        """Write the text representation of a single statistics dictionary.
 
         Args:
+            out (TextIO): stream to write into
             title (str): title of the summary
-            stats (Dict[str, Dict[str, str]]): statistics to stringify
+            stats (Dict[str, Dict[str, str]]): statistics to write
             padding (int, optional): left padding level. Defaults to 0.
             tab_space (int, optional): number of spaces per padding level.
                 Default to DEFAULT_TAB_SPACE.
-
-        Returns:
-            str: generated string
         """
-        tab = " " * padding * tab_space
-        txt = f"{tab}{title}:\n"
+        tab = " " * (padding + 1) * tab_space
+        lines = [f"{' ' * padding * tab_space}{title}:\n"]
 
         all_total = 0
         dup_total = 0
 
-        for severity in stats["all"]:
-            tab = " " * (padding + 1) * tab_space
-
-            all_value = stats["all"][severity]
+        for severity, all_value in stats["all"].items():
             dup_value = stats["duplicates"][severity]
             all_total += all_value
             dup_total += dup_value
 
             dup_str = f" ({dup_value} duplicates)" if dup_value > 0 else ""
-            txt += f"{tab}{severity}: {all_value}{dup_str}\n"
+            lines.append(f"{tab}{severity}: {all_value}{dup_str}\n")
 
         dup_str = f" ({dup_total} duplicates)" if dup_total > 0 else ""
-        txt += f"{tab}TOTAL: {all_total}{dup_str}\n"
+        lines.append(f"{tab}TOTAL: {all_total}{dup_str}\n")
 
-        return txt
+        out.write("".join(lines))
 
-    def __str__(self):
-        """Generate a string representation for the gathered statistics."""
+    def write(self, out: TextIO):
+        """Write the text representation of the gathered statistics.
+
+        Args:
+            out (TextIO): stream to write into
+        """
         n_charms = len(self.stats_per_charm)
         if n_charms == 0:
-            return ""
+            return
         elif n_charms == 1:
-            charm_name = list(self.stats_per_charm.keys())[0]
-            return LogParser.__single_stats_to_str(charm_name, self.global_stats)
+            charm_name = next(iter(self.stats_per_charm))
+            LogParser.__write_single_stats(out, charm_name, self.global_stats)
         else:
-            txt = LogParser.__single_stats_to_str("Global", self.global_stats)
+            LogParser.__write_single_stats(out, "Global", self.global_stats)
 
-            txt += "\nPer Charm:\n"
+            out.write("\nPer Charm:\n")
             for charm_name, charm_stats in self.stats_per_charm.items():
-                txt += LogParser.__single_stats_to_str(charm_name, charm_stats, 1)
-
-            return txt
-
+                LogParser.__write_single_stats(out, charm_name, charm_stats, 1)
 
-__all__ = ["DEFAULT_TAB_SPACE", "INITIAL_BASE_STATS", "LogParser"]
+    def __str__(self):
+        """Generate a string representation for the gathered statistics."""
+        out = StringIO()
+        self.write(out)
+        return out.getvalue()
+
+
+__all__ = [
+    "DEFAULT_TAB_SPACE",
+    "INITIAL_BASE_STATS",
+    "LOG_RECORD_FIELDS",
+    "LogParser",
+    "LogRecord",
+]
@@ -0,0 +1,183 @@
+#!/usr/bin/python
+"""LogRecordParser class implementation.
+
+This script contains a class named LogRecordParser that turns log lines
+into LogRecords, counting the lines it rejects by reason. Lines that do
+not contain the separator that follows the unit name (e.g., most of the
+continuation lines of Go stack traces and Python tracebacks) are rejected
+by a cheap search for it, before trying to match them against the log line
+format. The search does not reject any line that the format would match.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from log_parser import LOG_RECORD_FIELDS, LogRecord
+from utils import compile_unformat, leading_field_separator
+
+# Constants
+REJECTED_EMPTY = "empty"
+
+REJECTED_NO_UNIT_PREFIX = "no_unit_prefix"
+
+REJECTED_MALFORMED = "malformed"
+
+
+class LogRecordParser:
+    """A class used to parse log lines into LogRecords."""
+
+    def __init__(
+        self,
+        log_line_format: str,
+        multiline: bool = False,
+        rejected: Optional[Counter] = None,
+    ):
+        """Create a new LogRecordParser object.
+
+        Args:
+            log_line_format (str): Format of the log line
+            multiline (bool, optional): attach the non-empty lines that do not
+                match the log line format to the message of the previous log
+                entry. Defaults to False.
+            rejected (Counter, optional): counter of rejected lines by reason
+                to update. Defaults to a new Counter.
+        """
+        self.unformat_record = compile_unformat(log_line_format, LOG_RECORD_FIELDS)
+        self.separator = leading_field_separator(log_line_format)
+        self.multiline = multiline
+        self.rejected = Counter() if rejected is None else rejected
+        self.continuation_lines = 0
+
+    def get_rejected(self) -> Dict[str, int]:
+        """
+        Get the number of lines rejected by reason.
+
+        Returns:
+            Dict[str, int]: number of lines by reason
+        """
+        return dict(self.rejected)
+
+    def get_continuation_lines(self) -> int:
+        """
+        Get the number of lines attached to the previous log entry.
+
+        Returns:
+            int: number of lines attached (always 0 unless multiline is enabled)
+        """
+        return self.continuation_lines
+
+    def __reject(self, line: str) -> Optional[str]:
+        """Determine if a line must be rejected before matching it.
+
+        Args:
+            line (str): log line
+
+        Returns:
+            Optional[str]: the reason or None if the line must be matched
+        """
+        separator = self.separator
+        if separator is None or line.find(separator, 1) >= 0:
+            return None
+
+        return REJECTED_EMPTY if not line or line.isspace() else REJECTED_NO_UNIT_PREFIX
+
+    def parse_lines(self, lines: Iterable[str]) -> Iterator[LogRecord]:
+        """Produce the log records of a sequence of log lines.
+
+        Args:
+            lines (Iterable[str]): log lines to parse
+        """
+        if self.multiline:
+            return self.__parse_multiline(lines)
+
+        return self.__parse_single_line(lines)
+
+    def __parse_single_line(self, lines: Iterable[str]) -> Iterator[LogRecord]:
+        """Produce a log record for each valid log line.
+
+        Args:
+            lines (Iterable[str]): log lines to parse
+        """
+        unformat_record = self.unformat_record
+        rejected = self.rejected
+        separator = self.separator
+
+        for line in lines:
+            # Same check as __reject, inlined as it runs for every line
+            if separator is not None and line.find(separator, 1) < 0:
+                rejected[self.__reject(line)] += 1
+                continue
+
+            record = unformat_record(line)
+            if record is None:
+                rejected[REJECTED_MALFORMED] += 1
+                continue
+
+            yield record
+
+    def __parse_multiline(self, lines: Iterable[str]) -> Iterator[LogRecord]:
+        """Produce a log record for each log entry, which may span several lines.
+
+        Every non-empty line that follows a log entry and does not match the
+        format is attached to it, including the lines that look like a unit
+        prefix (e.g., "ValueError: bad thing" or "panic: runtime error"),
+        while empty lines are rejected so they do not change the message.
+
+        Args:
+            lines (Iterable[str]): log lines to parse
+        """
+        unformat_record = self.unformat_record
+        reject = self.__reject
+        rejected = self.rejected
+        pending = None  # last log entry, with its continuation lines
+        continuation = []
+
+        for line in lines:
+            if not line or line.isspace():
+                rejected[REJECTED_EMPTY] += 1
+                continue
+
+            reason = reject(line)
+            if reason is None:
+                record = unformat_record(line)
+                if record is not None:
+                    if pending is not None:
+                        yield LogRecordParser.__attach(pending, continuation)
+                    pending = record
+                    continuation = []
+                    continue
+                reason = REJECTED_MALFORMED
+
+            if pending is None:
+                rejected[reason] += 1
+            else:
+                continuation.append(line[:-1] if line.endswith("\n") else line)
+                self.continuation_lines += 1
+
+        if pending is not None:
+            yield LogRecordParser.__attach(pending, continuation)
+
+    @staticmethod
+    def __attach(record: LogRecord, continuation: List[str]) -> LogRecord:
+        """Attach continuation lines to the message of a log record.
+
+        Args:
+            record (LogRecord): log record
+            continuation (List[str]): continuation lines, without line terminators
+
+        Returns:
+            LogRecord: log record with the lines appended to its message
+        """
+        if not continuation:
+            return record
+
+        charm_name, severity_level, message = record
+        return charm_name, severity_level, "\n".join([message] + continuation)
+
+
+__all__ = [
+    "LogRecordParser",
+    "REJECTED_EMPTY",
+    "REJECTED_MALFORMED",
+    "REJECTED_NO_UNIT_PREFIX",
+]
@@ -5,9 +5,16 @@ from argparse import ArgumentError
 from inspect import Parameter
 #from sys import argv
 import sys
-from typing import Dict, List, Tuple
+from operator import itemgetter
+from typing import Dict, Iterator, List, Tuple, Union
 
-from log_parser import LogParser
+from log_parser import LOG_RECORD_FIELDS, LogParser, LogRecord
+from log_records import LogRecordParser
+from mem_profile import measure_log_parser, peak_rss, write_mem_report
+from report_renderers import DEFAULT_REPORT_FORMAT, RENDERERS, render_report
+from result_cache import ResultCache, default_cache_dir
+from rotated_logs import discover_rotated_logs, merged_log_reader
+from stats_server import DEFAULT_HOST, DEFAULT_PORT, StatsDaemon
 from utils import unformat
 
 # Constants
@@ -15,6 +22,23 @@ DEFAULT_LOG_LINE_FORMAT = (
     "{unit}: {hour}:{minutes}:{seconds} {severity_level} {charm_name} {message}\n"
 )
 
+# Supported options and whether they take a value (i.e., --name=value)
+OPTIONS = {
+    "no-cache": False,
+    "rotated": False,
+    "merge": True,
+    "format": True,
+    "mem-report": False,
+    "daemon": False,
+    "host": True,
+    "port": True,
+    "multiline": False,
+    "parse-errors": False,
+}
+
+# Options that only apply when reading a single log file
+SINGLE_FILE_OPTIONS = ["multiline", "parse-errors"]
+
 
 def to_process_log(log: Dict[str, str], selected_charm_name: str = None) -> bool:
     """Determine if the parsed log should be processed or not.
@@ -61,6 +85,75 @@ def log_file_reader(
     return (log for log in logs if to_process_log(log, selected_charm_name))
 
 
+def log_record_reader(
+    log_file: str,
+    log_line_format: str = DEFAULT_LOG_LINE_FORMAT,
+    selected_charm_name: str = None,
+    record_parser: LogRecordParser = None,
+) -> Iterator[LogRecord]:
+    """Produce a valid log record at each call.
+
+    Same as log_file_reader, but each log entry is produced as a
+    (charm name, severity level, message) tuple instead of a dictionary.
+
+    Args:
+        log_file (str): Path of the log file to parse
+        log_line_format (str, optional): Format of the log line.
+            Defaults to DEFAULT_LOG_LINE_FORMAT.
+        selected_charm_name (str, optional): Single charm to process
+        record_parser (LogRecordParser, optional): parser of the log lines,
+            which counts the rejected lines. Defaults to a new LogRecordParser
+            of single-line entries with the given log_line_format.
+    """
+    if record_parser is None:
+        record_parser = LogRecordParser(log_line_format)
+
+    # Create generator of valid log records
+    records = record_parser.parse_lines(open(log_file, mode="r"))
+
+    if selected_charm_name is None:
+        return records
+
+    return (record for record in records if record[0] == selected_charm_name)
+
+
+def parse_options(args: List[str]) -> Tuple[Dict[str, Union[bool, str]], List[str]]:
+    """Split the options (i.e., arguments prefixed with "--") from the arguments.
+
+    Args:
+        args (List[str]): List of arguments
+
+    Raises:
+        TypeError: Args cannot be None
+        TypeError: Unknown option
+        TypeError: Option requires or does not take a value
+
+    Returns:
+        Tuple[Dict[str, Union[bool, str]], List[str]]: Tuple with the parsed
+            options (flags map to True) and the remaining arguments
+    """
+    if args is None:
+        raise TypeError("Args cannot be None")
+
+    options = {}
+    remaining_args = []
+    for arg in args:
+        if not arg.startswith("--"):
+            remaining_args.append(arg)
+            continue
+
+        name, has_value, value = arg[2:].partition("=")
+        if name not in OPTIONS:
+            raise TypeError(f"Unknown option: --{name}")
+        if OPTIONS[name] != bool(has_value):
+            verb = "requires" if OPTIONS[name] else "does not take"
+            raise TypeError(f"Option --{name} {verb} a value")
+
+        options[name] = value if has_value else True
+
+    return options, remaining_args
+
+
 def parse_args(args: List[str]) -> Tuple[str, str]:
     """Parse arguments into a configurations dictionary.
 
@@ -83,27 +176,173 @@ def parse_args(args: List[str]) -> Tuple[str, str]:
         return args[1], args[2]  # file_name, selected_charm_name
 
 
+def print_mem_report(log_parser: LogParser):
+    """Print the memory used by a LogParser and the process into stderr.
+
+    Args:
+        log_parser (LogParser): LogParser to measure
+    """
+    report = measure_log_parser(log_parser)
+    report["peak_rss_bytes"] = peak_rss()
+    write_mem_report(report, sys.stderr)
+
+
+def print_parse_errors(record_parser: LogRecordParser):
+    """Print the number of lines rejected by reason into stderr.
+
+    When multiline is enabled, the number of lines attached to the previous
+    log entry is printed as well.
+
+    Args:
+        record_parser (LogRecordParser): parser that read the log lines
+    """
+    sys.stderr.write("Rejected lines:\n")
+    for reason, count in sorted(record_parser.get_rejected().items()):
+        sys.stderr.write(f"  {reason}: {count}\n")
+
+    if record_parser.multiline:
+        continuation_lines = record_parser.get_continuation_lines()
+        sys.stderr.write(f"Continuation lines: {continuation_lines}\n")
+
+
+def run_daemon(
+    log_files: List[str], selected_charm_name: str, host: str, port: int
+) -> int:
+    """Follow log files and serve their statistics until interrupted.
+
+    Args:
+        log_files (List[str]): Paths of the log files to follow
+        selected_charm_name (str): Single charm to process
+        host (str): address to listen on
+        port (int): port to listen on
+
+    Returns:
+        int: exit status
+    """
+    try:
+        daemon = StatsDaemon(
+            log_files, DEFAULT_LOG_LINE_FORMAT, selected_charm_name, host, port
+        )
+    except OSError as ex:
+        print(ex)
+        return -1
+
+    daemon.start()
+    host, port = daemon.get_server_address()
+    print(f"Serving statistics on http://{host}:{port}/stats and /metrics", flush=True)
+
+    try:
+        daemon.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+
+    return 0
+
+
 # Main
 def main(argv):
     # Process the arguments into variables
     try:
-        log_file, charm_name = parse_args(argv)
+        options, args = parse_options(argv)
+        log_file, charm_name = parse_args(args)
+        report_format = options.get("format", DEFAULT_REPORT_FORMAT)
+        if report_format not in RENDERERS:
+            raise TypeError(f"Unknown format: {report_format}")
+        host = options.get("host", DEFAULT_HOST)
+        port = options.get("port", str(DEFAULT_PORT))
+        if not port.isdigit():
+            raise TypeError(f"Invalid port: {port}")
+        for name in SINGLE_FILE_OPTIONS:
+            if name in options and "daemon" in options:
+                raise TypeError(f"Option --{name} cannot be used with --daemon")
+            if name in options and ("rotated" in options or "merge" in options):
+                raise TypeError(f"Option --{name} requires a single log file")
     except TypeError as ex:
         print(ex)
         print(f"Usage: {argv[0]} FILE [CHARM]")
         return -1
 
+    # Find the sets of log files to merge (e.g., a log file and its backups)
+    log_files = [log_file]
+    if "merge" in options:
+        log_files += [path for path in options["merge"].split(",") if path]
+
+    try:
+        if options.get("rotated"):
+            log_sets = [discover_rotated_logs(path) for path in log_files]
+        else:
+            log_sets = [[path] for path in log_files]
+    except FileNotFoundError as ex:
+        print(ex)
+        return -1
+
+    # Follow the current log files and serve their statistics over HTTP
+    if options.get("daemon"):
+        return run_daemon(log_files, charm_name, host, int(port))
+
+    # Reuse the statistics of a previous run over the same (unchanged) files,
+    # unless the rejected lines or the memory held by the unique messages are
+    # requested, as those are not cached
+    result_cache = None
+    cache_key = None
+    multiline = bool(options.get("multiline"))
+    record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT, multiline)
+    if not options.get("no-cache"):
+        result_cache = ResultCache(default_cache_dir())
+        try:
+            cache_key = result_cache.make_key(
+                [path for log_set in log_sets for path in log_set],
+                {
+                    "charm": charm_name,
+                    "format": report_format,
+                    "multiline": multiline,
+                    # Files read one after the other by each set (merged by timestamp)
+                    "sets": [len(log_set) for log_set in log_sets],
+                },
+            )
+        except OSError:
+            cache_key = None  # let the reader report the error
+
+    uncached = options.get("parse-errors") or options.get("mem-report")
+    if cache_key is not None and not uncached:
+        log_parser = result_cache.get(cache_key)
+        if log_parser is not None:
+            render_report(log_parser, sys.stdout, report_format)
+            result_cache.save_counters()
+            return 0
+
     try:
-        # Create a reader for the log file that returns parsed valid logs
-        log_reader = log_file_reader(log_file, DEFAULT_LOG_LINE_FORMAT, charm_name)
+        # Create a reader for the log files that returns valid log records
+        if len(log_sets) == 1 and len(log_sets[0]) == 1:
+            record_reader = log_record_reader(
+                log_file, DEFAULT_LOG_LINE_FORMAT, charm_name, record_parser
+            )
+        else:
+            log_reader = merged_log_reader(
+                log_sets, DEFAULT_LOG_LINE_FORMAT, charm_name
+            )
+            record_reader = map(itemgetter(*LOG_RECORD_FIELDS), log_reader)
     except FileNotFoundError as ex:
         print(ex)
         return -1
 
-    # Process the logs provided by the log_reader using a LogParser
+    # Process the records provided by the record_reader using a LogParser
     log_parser = LogParser()
-    log_parser.process_logs(log_reader)
-    print(log_parser)
+    log_parser.process_records(record_reader)
+    render_report(log_parser, sys.stdout, report_format)
+
+    if cache_key is not None:
+        result_cache.put(cache_key, log_parser)
+        result_cache.save_counters()
+
+    if options.get("parse-errors"):
+        print_parse_errors(record_parser)
+
+    if options.get("mem-report"):
+        print_mem_report(log_parser)
+
     return 0
 
 if __name__ == "__main__":
@@ -0,0 +1,220 @@
+#!/usr/bin/python
+"""This script contains a set of functions to measure memory usage.
+
+These functions measure the memory held by a LogParser (per unique message
+and per charm), the memory allocated by the reader stages while streaming
+log lines, and the peak resident set size of the process. They are used by
+main.py --mem-report and by the memory budgets of the test suite.
+"""
+
+import random
+import sys
+import tracemalloc
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+from log_parser import INITIAL_BASE_STATS, LogParser
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Constants
+DEFAULT_MESSAGE_LENGTH = 48  # characters
+
+
+def generate_log_lines(
+    n_lines: int,
+    n_charms: int = 100,
+    duplicate_ratio: float = 0.5,
+    message_length: int = DEFAULT_MESSAGE_LENGTH,
+    seed: int = 0,
+) -> Iterator[str]:
+    """Produce synthetic log lines with a given share of duplicate messages.
+
+    Args:
+        n_lines (int): number of lines to produce
+        n_charms (int, optional): number of different charms. Defaults to 100.
+        duplicate_ratio (float, optional): probability of a line repeating a
+            previous message. Defaults to 0.5.
+        message_length (int, optional): length of the messages.
+            Defaults to DEFAULT_MESSAGE_LENGTH.
+        seed (int, optional): seed of the random generator. Defaults to 0.
+    """
+    rng = random.Random(seed)
+    severities = list(INITIAL_BASE_STATS)
+    previous = []
+
+    for i in range(n_lines):
+        if previous and rng.random() < duplicate_ratio:
+            charm_name, severity_level, message = rng.choice(previous)
+        else:
+            charm_name = f"juju.charm-{rng.randrange(n_charms)}"
+            severity_level = rng.choice(severities)
+            message = f"message {i} ".ljust(message_length, "x")
+            previous.append((charm_name, severity_level, message))
+
+        seconds = i % 86400
+        yield (
+            f"machine-{i % 8}: {seconds // 3600:02}:{seconds // 60 % 60:02}:"
+            f"{seconds % 60:02} {severity_level} {charm_name} {message}\n"
+        )
+
+
+def deep_size(obj: Any) -> int:
+    """Get the size in bytes of an object and of the containers and values it holds.
+
+    Args:
+        obj (Any): object to measure (e.g., nested dictionaries or sets)
+
+    Returns:
+        int: size in bytes, counting shared objects only once
+    """
+    seen = set()
+    pending = [obj]
+    size = 0
+
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+
+    return size
+
+
+def peak_rss() -> Optional[int]:
+    """Get the peak resident set size of the process.
+
+    Returns:
+        Optional[int]: peak RSS in bytes or None if it cannot be measured
+    """
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, while macOS reports bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def measure_log_parser(log_parser: LogParser) -> Dict[str, float]:
+    """Measure the memory held by the statistics and messages of a LogParser.
+
+    Args:
+        log_parser (LogParser): LogParser to measure
+
+    Returns:
+        Dict[str, float]: number of unique messages and charms, the bytes
+            held by each of them, and the bytes per unique message and charm
+    """
+    processed_messages = log_parser.get_processed_messages()
+    stats_per_charm = log_parser.get_stats_per_charm()
+
+    messages_bytes = deep_size(processed_messages)
+    charms_bytes = deep_size(stats_per_charm)
+
+    return {
+        "unique_messages": len(processed_messages),
+        "messages_bytes": messages_bytes,
+        "bytes_per_unique_message": messages_bytes / max(len(processed_messages), 1),
+        "charms": len(stats_per_charm),
+        "charms_bytes": charms_bytes,
+        "bytes_per_charm": charms_bytes / max(len(stats_per_charm), 1),
+    }
+
+
+def profile_log_parser(logs: Iterable[Dict[str, str]]) -> Dict[str, float]:
+    """Trace the memory allocated by a LogParser while processing parsed logs.
+
+    Args:
+        logs (Iterable[Dict[str, str]]): parsed log entries to process
+
+    Returns:
+        Dict[str, float]: the measures of measure_log_parser, plus the traced
+            bytes retained by the LogParser per unique message and the traced
+            peak in bytes
+    """
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        log_parser = LogParser()
+        log_parser.process_logs(logs)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    report = measure_log_parser(log_parser)
+    report["traced_bytes_per_unique_message"] = (retained - baseline) / max(
+        report["unique_messages"], 1
+    )
+    report["traced_peak_bytes"] = peak - baseline
+    return report
+
+
+def profile_stage(entries: Iterable[Any]) -> Dict[str, float]:
+    """Trace the memory allocated while streaming the entries of a reader stage.
+
+    The entries are consumed one at a time and discarded, so the traced peak
+    measures what the stage holds in memory beyond the current entry.
+
+    Args:
+        entries (Iterable[Any]): entries produced by the stage
+
+    Returns:
+        Dict[str, float]: number of entries, average size in bytes of an
+            entry and the traced peak in bytes
+    """
+    n_entries = 0
+    entries_bytes = 0
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for entry in entries:
+            n_entries += 1
+            if n_entries <= 1000:  # sample the size of the first entries
+                entries_bytes += deep_size(entry)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "entries": n_entries,
+        "bytes_per_entry": entries_bytes / max(min(n_entries, 1000), 1),
+        "traced_peak_bytes": peak - baseline,
+    }
+
+
+def write_mem_report(report: Dict[str, Optional[float]], out: TextIO):
+    """Write a memory report in a human readable form.
+
+    Args:
+        report (Dict[str, Optional[float]]): measures to write
+        out (TextIO): stream to write into
+    """
+    out.write("Memory:\n")
+    for name, value in report.items():
+        if value is None:
+            value = "n/a"
+        elif isinstance(value, float):
+            value = f"{value:.1f}"
+        out.write(f"  {name}: {value}\n")
+
+
+__all__ = [
+    "deep_size",
+    "generate_log_lines",
+    "measure_log_parser",
+    "peak_rss",
+    "profile_log_parser",
+    "profile_stage",
+    "write_mem_report",
+]
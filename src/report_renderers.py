@@ -0,0 +1,162 @@
+#!/usr/bin/python
+"""This script contains a set of functions that render LogParser reports.
+
+Each renderer writes the statistics gathered by a LogParser straight into
+an output stream (e.g., sys.stdout), one charm at a time, without building
+the whole report in memory.
+"""
+
+import csv
+import json
+from typing import Callable, Dict, TextIO
+
+from log_parser import LogParser
+
+# Constants
+DEFAULT_REPORT_FORMAT = "text"
+
+PROMETHEUS_METRICS = [
+    # (metric name suffix, statistics kind, help text)
+    ("messages_total", "all", "Number of log messages"),
+    ("duplicate_messages_total", "duplicates", "Number of duplicate log messages"),
+]
+
+
+def render_text(log_parser: LogParser, out: TextIO):
+    """Write the human readable report followed by an empty line.
+
+    The output is the same as print(log_parser).
+
+    Args:
+        log_parser (LogParser): LogParser holding the statistics
+        out (TextIO): stream to write into
+    """
+    log_parser.write(out)
+    out.write("\n")
+
+
+def render_json(log_parser: LogParser, out: TextIO):
+    """Write the statistics as a JSON document.
+
+    The document has the same structure as the dictionary returned by
+    LogParser.to_dict.
+
+    Args:
+        log_parser (LogParser): LogParser holding the statistics
+        out (TextIO): stream to write into
+    """
+    out.write('{"global": ')
+    out.write(json.dumps(log_parser.get_global_stats()))
+    out.write(', "per_charm": {')
+
+    separator = ""
+    for charm_name, charm_stats in log_parser.get_stats_per_charm().items():
+        out.write(f"{separator}{json.dumps(charm_name)}: {json.dumps(charm_stats)}")
+        separator = ", "
+
+    out.write("}}\n")
+
+
+def render_csv(log_parser: LogParser, out: TextIO):
+    """Write the statistics as CSV, with one row per charm and severity level.
+
+    The rows of the global statistics have an empty charm name.
+
+    Args:
+        log_parser (LogParser): LogParser holding the statistics
+        out (TextIO): stream to write into
+    """
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["charm", "severity", "messages", "duplicates"])
+
+    def write_stats(charm_name: str, stats: Dict[str, Dict[str, str]]):
+        writer.writerows(
+            [charm_name, severity, all_value, stats["duplicates"][severity]]
+            for severity, all_value in stats["all"].items()
+        )
+
+    write_stats("", log_parser.get_global_stats())
+    for charm_name, charm_stats in log_parser.get_stats_per_charm().items():
+        write_stats(charm_name, charm_stats)
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a Prometheus label value.
+
+    Args:
+        value (str): label value to escape
+
+    Returns:
+        str: the escaped label value
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(log_parser: LogParser, out: TextIO):
+    """Write the statistics in the Prometheus text exposition format.
+
+    The global statistics are exported with a severity label only, while
+    the statistics of each charm are exported with charm and severity labels
+    under the same metric name prefixed by "juju_log_charm_".
+
+    Args:
+        log_parser (LogParser): LogParser holding the statistics
+        out (TextIO): stream to write into
+    """
+    global_stats = log_parser.get_global_stats()
+    stats_per_charm = log_parser.get_stats_per_charm()
+
+    for suffix, kind, help_text in PROMETHEUS_METRICS:
+        name = f"juju_log_{suffix}"
+        out.write(f"# HELP {name} {help_text}.\n# TYPE {name} counter\n")
+        for severity, value in global_stats[kind].items():
+            out.write(f'{name}{{severity="{severity}"}} {value}\n')
+
+    for suffix, kind, help_text in PROMETHEUS_METRICS:
+        name = f"juju_log_charm_{suffix}"
+        out.write(f"# HELP {name} {help_text} per charm.\n# TYPE {name} counter\n")
+        for charm_name, charm_stats in stats_per_charm.items():
+            charm_label = _escape_label_value(charm_name)
+            out.write(
+                "".join(
+                    f'{name}{{charm="{charm_label}",severity="{severity}"}} {value}\n'
+                    for severity, value in charm_stats[kind].items()
+                )
+            )
+
+
+RENDERERS: Dict[str, Callable[[LogParser, TextIO], None]] = {
+    "text": render_text,
+    "json": render_json,
+    "csv": render_csv,
+    "prometheus": render_prometheus,
+}
+
+
+def render_report(log_parser: LogParser, out: TextIO, report_format: str):
+    """Write the statistics gathered by a LogParser in the selected format.
+
+    Args:
+        log_parser (LogParser): LogParser holding the statistics
+        out (TextIO): stream to write into
+        report_format (str): one of the keys of RENDERERS
+
+    Raises:
+        ValueError: unknown report format
+    """
+    renderer = RENDERERS.get(report_format)
+    if renderer is None:
+        raise ValueError(f"Unknown format: {report_format}")
+
+    renderer(log_parser, out)
+
+
+__all__ = [
+    "DEFAULT_REPORT_FORMAT",
+    "RENDERERS",
+    "render_csv",
+    "render_json",
+    "render_prometheus",
+    "render_report",
+    "render_text",
+]
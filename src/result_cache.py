@@ -0,0 +1,316 @@
+#!/usr/bin/python
+"""ResultCache class implementation.
+
+This script contains a class named ResultCache that stores the statistics
+gathered by a LogParser on disk, so that unchanged log files do not need
+to be parsed again.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from log_parser import LogParser
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+# Constants
+CACHE_DIR_ENV_VAR = "JUJU_LOG_PARSER_CACHE_DIR"
+
+# Version of the entries, to increase whenever their format or the rules
+# used to gather the statistics change, so older entries are not served
+CACHE_VERSION = 4
+
+DEFAULT_MAX_CACHE_SIZE = 64 * 1024 * 1024  # bytes
+
+SAMPLE_SIZE = 64 * 1024  # bytes read from each sampled region of a file
+
+ENTRY_SUFFIX = ".entry"
+
+COUNTERS_FILE = "counters.json"
+
+COUNTERS_LOCK_FILE = "counters.lock"
+
+COUNTER_NAMES = ("hits", "misses", "stores", "evictions")
+
+
+def default_cache_dir() -> str:
+    """Get the directory where the results are cached by default.
+
+    Returns:
+        str: the value of CACHE_DIR_ENV_VAR if defined, otherwise
+            a directory inside the user's cache directory
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if cache_dir:
+        return cache_dir
+
+    base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base_dir, "juju-log-parser")
+
+
+def sample_hash(file_path: str, size: int, sample_size: int = SAMPLE_SIZE) -> str:
+    """Hash the beginning, the middle and the end of a file.
+
+    Small files (up to three samples long) are hashed entirely.
+
+    Args:
+        file_path (str): Path of the file to hash
+        size (int): size of the file in bytes
+        sample_size (int, optional): number of bytes of each sample.
+            Defaults to SAMPLE_SIZE.
+
+    Returns:
+        str: hexadecimal digest of the sampled content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    with open(file_path, mode="rb") as file:
+        if size <= 3 * sample_size:
+            digest.update(file.read())
+        else:
+            for offset in (0, (size - sample_size) // 2, size - sample_size):
+                file.seek(offset)
+                digest.update(file.read(sample_size))
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """A class used to cache the statistics gathered from log files.
+
+    Each entry is identified by CACHE_VERSION, by the identity of the log
+    files (path, size, modification time and a sampled hash of their content)
+    and by the query parameters. Entries are stored as compressed JSON files
+    and the least recently used ones are evicted once the cache exceeds its
+    maximum size.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_CACHE_SIZE):
+        """Create a new ResultCache object.
+
+        The cache directory is only created when the first entry is stored.
+
+        Args:
+            cache_dir (str): directory where the entries are stored
+            max_size (int, optional): maximum size of the cache in bytes.
+                Defaults to DEFAULT_MAX_CACHE_SIZE.
+
+        Raises:
+            TypeError: cache_dir cannot be None
+        """
+        if cache_dir is None:
+            raise TypeError("cache_dir cannot be None")
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.counters = Counter({name: 0 for name in COUNTER_NAMES})
+
+    @staticmethod
+    def make_key(log_files: List[str], params: Dict[str, Any]) -> str:
+        """Compute the key of the entry for a set of log files and query parameters.
+
+        Args:
+            log_files (List[str]): Paths of the log files
+            params (Dict[str, Any]): query parameters (e.g., selected charm name)
+
+        Raises:
+            OSError: some log file cannot be read
+
+        Returns:
+            str: the entry key
+        """
+        identity = [CACHE_VERSION]
+        for log_file in log_files:
+            file_stat = os.stat(log_file)
+            identity.append(
+                [
+                    os.path.abspath(log_file),
+                    file_stat.st_size,
+                    file_stat.st_mtime_ns,
+                    sample_hash(log_file, file_stat.st_size),
+                ]
+            )
+        identity.append(sorted(params.items()))
+
+        raw_identity = json.dumps(identity, separators=(",", ":")).encode()
+        return hashlib.blake2b(raw_identity, digest_size=20).hexdigest()
+
+    def __entry_path(self, key: str) -> str:
+        """Get the path of the file that stores an entry.
+
+        Args:
+            key (str): entry key
+
+        Returns:
+            str: path of the entry file
+        """
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[LogParser]:
+        """Get the cached statistics of an entry.
+
+        Unreadable or corrupted entries are considered misses.
+
+        Args:
+            key (str): entry key
+
+        Returns:
+            Optional[LogParser]: LogParser holding the cached statistics
+                or None if there is no such entry
+        """
+        entry_path = self.__entry_path(key)
+
+        try:
+            with open(entry_path, mode="rb") as entry_file:
+                state = json.loads(zlib.decompress(entry_file.read()))
+            log_parser = LogParser.from_dict(state)
+        except (OSError, ValueError, TypeError, KeyError, zlib.error):
+            self.counters["misses"] += 1
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        self.counters["hits"] += 1
+        return log_parser
+
+    def put(self, key: str, log_parser: LogParser):
+        """Store the statistics of a LogParser, evicting old entries if needed.
+
+        Failing to write into the cache directory is not considered an error.
+
+        Args:
+            key (str): entry key
+            log_parser (LogParser): LogParser holding the statistics to store
+        """
+        state = json.dumps(log_parser.to_dict(), separators=(",", ":"))
+        entry_path = self.__entry_path(key)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, mode="wb") as entry_file:
+                entry_file.write(zlib.compress(state.encode()))
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            return
+
+        self.counters["stores"] += 1
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the size cap is met."""
+        try:
+            file_names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+
+        entries = []
+        total_size = 0
+        for file_name in file_names:
+            if not file_name.endswith(ENTRY_SUFFIX):
+                continue
+
+            try:
+                entry_stat = os.stat(os.path.join(self.cache_dir, file_name))
+            except OSError:
+                continue
+
+            entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, file_name))
+            total_size += entry_stat.st_size
+
+        entries.sort()
+        for _, entry_size, file_name in entries:
+            if total_size <= self.max_size:
+                break
+
+            try:
+                os.remove(os.path.join(self.cache_dir, file_name))
+            except OSError:
+                continue
+
+            total_size -= entry_size
+            self.counters["evictions"] += 1
+
+    def get_counters(self) -> Dict[str, int]:
+        """
+        Get the counters of the operations performed by this object.
+
+        Returns:
+            Dict[str, int]: number of hits, misses, stores and evictions
+        """
+        return dict(self.counters)
+
+    def load_counters(self) -> Dict[str, int]:
+        """
+        Get the counters accumulated by every run that saved them.
+
+        Returns:
+            Dict[str, int]: number of hits, misses, stores and evictions
+        """
+        counters = {name: 0 for name in COUNTER_NAMES}
+
+        try:
+            with open(os.path.join(self.cache_dir, COUNTERS_FILE), mode="r") as file:
+                saved = json.load(file)
+            for name in COUNTER_NAMES:
+                counters[name] = int(saved.get(name, 0))
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+
+        return counters
+
+    def save_counters(self):
+        """Add the counters of this object to the accumulated counters.
+
+        The accumulated counters are updated while holding an exclusive lock
+        on COUNTERS_LOCK_FILE, so concurrent runs do not lose their updates.
+        Where file locks are not supported (i.e., on Windows), concurrent
+        updates may be lost.
+        """
+        if not any(self.counters.values()):
+            return
+
+        counters_path = os.path.join(self.cache_dir, COUNTERS_FILE)
+        lock_path = os.path.join(self.cache_dir, COUNTERS_LOCK_FILE)
+        tmp_path = f"{counters_path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(lock_path, mode="a") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)  # released when closed
+
+                counters = self.load_counters()
+                for name in COUNTER_NAMES:
+                    counters[name] += self.counters[name]
+
+                with open(tmp_path, mode="w") as file:
+                    json.dump(counters, file)
+                os.replace(tmp_path, counters_path)
+        except OSError:
+            return
+
+        self.counters = Counter({name: 0 for name in COUNTER_NAMES})
+
+
+__all__ = [
+    "CACHE_DIR_ENV_VAR",
+    "CACHE_VERSION",
+    "DEFAULT_MAX_CACHE_SIZE",
+    "ResultCache",
+    "default_cache_dir",
+    "sample_hash",
+]
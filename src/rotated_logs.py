@@ -0,0 +1,343 @@
+#!/usr/bin/python
+"""This script contains a set of functions to read rotated log files.
+
+When a log file is rotated, its older entries are moved into backup files
+(e.g., machine-0-2022-08-30T10-15-00.000.log or machine-0.log.1) whose
+content may overlap with the current log file and with other logs that
+aggregate the same entries (e.g., all-machines.log). These functions merge
+such sets of files into a single stream of parsed log entries ordered by
+timestamp, where the entries repeated across files are only produced once.
+"""
+
+import gzip
+import heapq
+import os
+import re
+from itertools import chain
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from utils import unformat
+
+# Constants
+PREFETCH_CHUNK_SIZE = 1024  # lines
+
+PREFETCH_DEPTH = 16  # chunks
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Backups named by lumberjack (used by Juju), e.g. machine-0-2022-08-30T10-15-00.000.log
+TIMESTAMPED_BACKUP_FORMAT = (
+    r"{stem}-(\d{{4}}-\d{{2}}-\d{{2}}T\d{{2}}-\d{{2}}-\d{{2}}(?:\.\d+)?){ext}(?:\.gz)?"
+)
+
+# Backups named by logrotate, e.g. machine-0.log.1 or machine-0.log.2.gz
+NUMBERED_BACKUP_FORMAT = r"{name}\.(\d+)(?:\.gz)?"
+
+
+def discover_rotated_logs(log_file: str) -> List[str]:
+    """Find the rotated backups of a log file.
+
+    Args:
+        log_file (str): Path of the current log file
+
+    Raises:
+        FileNotFoundError: log file does not exist
+
+    Returns:
+        List[str]: paths of the backups, from the oldest to the newest,
+            followed by the path of the log file itself
+    """
+    # Raise FileNotFoundError early if the log file does not exist
+    os.stat(log_file)
+
+    log_dir, name = os.path.split(log_file)
+    stem, ext = os.path.splitext(name)
+
+    timestamped_re = re.compile(
+        TIMESTAMPED_BACKUP_FORMAT.format(stem=re.escape(stem), ext=re.escape(ext))
+    )
+    numbered_re = re.compile(NUMBERED_BACKUP_FORMAT.format(name=re.escape(name)))
+
+    backups = []
+    for file_name in os.listdir(log_dir or "."):
+        match = numbered_re.fullmatch(file_name)
+        if match is not None:
+            # logrotate backups with higher numbers are older
+            backups.append(((0, -int(match.group(1)), ""), file_name))
+            continue
+
+        match = timestamped_re.fullmatch(file_name)
+        if match is not None:
+            backups.append(((1, 0, match.group(1)), file_name))
+
+    backups.sort()
+    return [os.path.join(log_dir, file_name) for _, file_name in backups] + [log_file]
+
+
+def open_log(log_file: str) -> TextIO:
+    """Open a log file for reading, decompressing it if needed.
+
+    Args:
+        log_file (str): Path of the log file
+
+    Returns:
+        TextIO: the opened log file
+    """
+    if log_file.endswith(".gz"):
+        return gzip.open(log_file, mode="rt")
+
+    return open(log_file, mode="r")
+
+
+def sequential_lines(log_files: Iterable[str]) -> Iterator[str]:
+    """Produce the lines of several log files, one file after the other.
+
+    Args:
+        log_files (Iterable[str]): Paths of the log files to read
+    """
+    for log_file in log_files:
+        with open_log(log_file) as file:
+            yield from file
+
+
+def prefetched(
+    iterable: Iterable,
+    chunk_size: int = PREFETCH_CHUNK_SIZE,
+    depth: int = PREFETCH_DEPTH,
+) -> Iterator:
+    """Produce the items of an iterable that is consumed ahead in the background.
+
+    The items are read by a separate thread in chunks, up to a given number
+    of chunks ahead of the consumer. Exceptions raised while reading are
+    raised again to the consumer.
+
+    Args:
+        iterable (Iterable): Iterable to consume
+        chunk_size (int, optional): number of items per chunk.
+            Defaults to PREFETCH_CHUNK_SIZE.
+        depth (int, optional): maximum number of chunks read ahead.
+            Defaults to PREFETCH_DEPTH.
+    """
+    chunks = Queue(maxsize=depth)
+    stopped = Event()
+
+    def put(chunk) -> bool:
+        while not stopped.is_set():
+            try:
+                chunks.put(chunk, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def producer():
+        try:
+            chunk = []
+            for item in iterable:
+                chunk.append(item)
+                if len(chunk) == chunk_size:
+                    if not put((chunk, None)):
+                        return
+                    chunk = []
+            put((chunk, StopIteration()))
+        except Exception as ex:  # pylint: disable=broad-except
+            put(([], ex))
+
+    Thread(target=producer, daemon=True).start()
+
+    try:
+        while True:
+            try:
+                chunk, ex = chunks.get(timeout=0.1)
+            except Empty:
+                continue
+
+            yield from chunk
+
+            if isinstance(ex, StopIteration):
+                return
+            if ex is not None:
+                raise ex
+    finally:
+        stopped.set()
+
+
+def timestamped_logs(
+    lines: Iterable[str], log_line_format: str
+) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Produce the parsed log entries of a sequence of lines with their timestamp.
+
+    As the log entries only record the time of the day, the timestamps
+    (in seconds) roll over into the next day whenever the time goes back by
+    more than twelve hours. Lines that do not match the format are ignored.
+
+    Args:
+        lines (Iterable[str]): lines to parse, in chronological order
+        log_line_format (str): Format of the log line
+    """
+    day = 0
+    last_seconds = 0
+
+    for line in lines:
+        log = unformat(line, log_line_format)
+        if log is None:
+            continue
+
+        try:
+            seconds = (
+                int(log["hour"]) * 3600 + int(log["minutes"]) * 60 + int(log["seconds"])
+            )
+        except (KeyError, ValueError):
+            seconds = last_seconds
+
+        if seconds < last_seconds - SECONDS_PER_DAY // 2:
+            day += 1
+        last_seconds = seconds
+
+        yield day * SECONDS_PER_DAY + seconds, log
+
+
+def merged_log_reader(
+    log_sets: List[List[str]],
+    log_line_format: str,
+    selected_charm_name: Optional[str] = None,
+    prefetch: bool = True,
+) -> Iterator[Dict[str, str]]:
+    """Produce the parsed log entries of several sets of log files in order.
+
+    The files of each set (e.g., a log file and its rotated backups) are read
+    one after the other, while the sets are merged by timestamp. A log entry
+    that is produced by several sets with the same timestamp (i.e., a copy of
+    the same entry in overlapping files) is only produced once. As the entries
+    only record the time of the day, each set is assumed to start less than
+    twelve hours apart from the first set, and its timestamps are shifted by
+    a day when needed (e.g., a backup that starts before midnight merged with
+    a log file that starts after it). The entries repeated inside the same
+    set, including across its files, are all produced, so they are counted
+    as duplicates by the LogParser.
+
+    Args:
+        log_sets (List[List[str]]): Sets of paths of the log files, where the
+            files of each set are ordered from the oldest to the newest
+        log_line_format (str): Format of the log line
+        selected_charm_name (str, optional): Single charm to process
+        prefetch (bool, optional): read the files ahead in the background.
+            Defaults to True.
+
+    Raises:
+        FileNotFoundError: some log file does not exist
+    """
+    # Raise FileNotFoundError early if some log file does not exist
+    for log_set in log_sets:
+        for log_file in log_set:
+            os.stat(log_file)
+
+    sources = []
+    first_timestamps = []
+    for log_set in log_sets:
+        lines = sequential_lines(log_set)
+        if prefetch:
+            lines = prefetched(lines)
+        timestamped = timestamped_logs(lines, log_line_format)
+        first_entry = next(timestamped, None)
+        if first_entry is not None:
+            timestamped = chain([first_entry], timestamped)
+
+        first_timestamps.append(None if first_entry is None else first_entry[0])
+        sources.append(timestamped)
+
+    offsets = _day_offsets(first_timestamps)
+    sources = [
+        _with_source(timestamped, index, offset)
+        for index, (timestamped, offset) in enumerate(zip(sources, offsets))
+    ]
+
+    merged_entries = heapq.merge(*sources, key=lambda entry: entry[0])
+    return _deduplicated(merged_entries, selected_charm_name)
+
+
+def _day_offsets(first_timestamps: List[Optional[int]]) -> List[int]:
+    """Get the offsets that align the timestamps of each set with the first set.
+
+    Args:
+        first_timestamps (List[Optional[int]]): timestamp of the first entry
+            of each set, or None if the set is empty
+
+    Returns:
+        List[int]: offset in seconds (zero or plus or minus one day) that
+            brings the first entry of each set closest to the first entry
+            of the first non-empty set
+    """
+    reference = next((t for t in first_timestamps if t is not None), None)
+
+    offsets = []
+    for timestamp in first_timestamps:
+        offset = 0
+        if timestamp is not None:
+            if timestamp < reference - SECONDS_PER_DAY // 2:
+                offset = SECONDS_PER_DAY
+            elif timestamp > reference + SECONDS_PER_DAY // 2:
+                offset = -SECONDS_PER_DAY
+        offsets.append(offset)
+
+    return offsets
+
+
+def _with_source(
+    timestamped: Iterable[Tuple[int, Dict[str, str]]], source: int, offset: int = 0
+) -> Iterator[Tuple[int, int, Dict[str, str]]]:
+    """Tag timestamped log entries with the index of the set that produced them.
+
+    Args:
+        timestamped (Iterable[Tuple[int, Dict[str, str]]]): (timestamp,
+            parsed log) tuples
+        source (int): index of the set of log files
+        offset (int, optional): seconds to add to the timestamps. Defaults to 0.
+    """
+    for timestamp, log in timestamped:
+        yield timestamp + offset, source, log
+
+
+def _deduplicated(
+    entries: Iterable[Tuple[int, int, Dict[str, str]]],
+    selected_charm_name: Optional[str],
+) -> Iterator[Dict[str, str]]:
+    """Drop the copies of the same log entry produced by different sources.
+
+    Args:
+        entries (Iterable[Tuple[int, int, Dict[str, str]]]): (timestamp,
+            source index, parsed log) tuples ordered by timestamp
+        selected_charm_name (str, optional): Single charm to process
+    """
+    current_timestamp = None
+    counts = {}  # (entry, source) -> occurrences with the current timestamp
+    produced = {}  # entry -> occurrences produced with the current timestamp
+
+    for timestamp, source, log in entries:
+        if timestamp != current_timestamp:
+            current_timestamp = timestamp
+            counts.clear()
+            produced.clear()
+
+        entry = tuple(log.values())
+        count = counts.get((entry, source), 0) + 1
+        counts[(entry, source)] = count
+
+        if count <= produced.get(entry, 0):
+            continue  # copy of an entry already produced by another source
+        produced[entry] = count
+
+        if selected_charm_name is None or log.get("charm_name") == selected_charm_name:
+            yield log
+
+
+__all__ = [
+    "discover_rotated_logs",
+    "merged_log_reader",
+    "open_log",
+    "prefetched",
+    "sequential_lines",
+    "timestamped_logs",
+]
@@ -0,0 +1,376 @@
+#!/usr/bin/python
+"""StatsDaemon class implementation.
+
+This script contains a class named StatsDaemon that follows one or more
+log files into a LogParser and serves the gathered statistics over HTTP,
+as JSON (/stats) and in the Prometheus text format (/metrics).
+
+The statistics are read by the HTTP requests from immutable snapshots that
+the ingestion thread publishes periodically, so a request never blocks nor
+slows down the processing of new log entries.
+"""
+
+import os
+import sys
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import TextIOWrapper
+from threading import Event, Thread
+from time import monotonic
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from log_parser import INITIAL_BASE_STATS, LogParser, LogRecord
+from log_records import LogRecordParser
+from report_renderers import render_json, render_prometheus
+
+# Constants
+DEFAULT_HOST = "127.0.0.1"
+
+DEFAULT_PORT = 9180
+
+DEFAULT_POLL_INTERVAL = 0.5  # seconds
+
+DEFAULT_PUBLISH_INTERVAL = 1.0  # seconds
+
+MAX_LINES_PER_READ = 10000
+
+# Reason of the rejected log records whose severity level is not supported
+REJECTED_UNKNOWN_SEVERITY = "unknown_severity"
+
+# Path -> (renderer, content type)
+ENDPOINTS = {
+    "/stats": (render_json, "application/json"),
+    "/metrics": (render_prometheus, "text/plain; version=0.0.4"),
+}
+
+
+class LogFollower:
+    """A class used to read the lines appended to a log file."""
+
+    def __init__(self, log_file: str):
+        """Create a new LogFollower object.
+
+        The log file is read from the beginning.
+
+        Args:
+            log_file (str): Path of the log file to follow
+        """
+        self.log_file = log_file
+        self.file = None
+        self.partial_line = b""
+
+    def __reopen_if_rotated(self) -> bool:
+        """Open the log file again if it was replaced or truncated.
+
+        Returns:
+            bool: the log file was opened
+        """
+        try:
+            file_stat = os.stat(self.log_file)
+        except FileNotFoundError:
+            return False  # keep reading the old file until a new one is created
+
+        if self.file is not None:
+            open_stat = os.fstat(self.file.fileno())
+            if (
+                open_stat.st_ino == file_stat.st_ino
+                and open_stat.st_dev == file_stat.st_dev
+                and file_stat.st_size >= self.file.tell()
+            ):
+                return False
+            self.close()
+
+        self.file = open(self.log_file, mode="rb")
+        self.partial_line = b""
+        return True
+
+    def __read_complete_lines(self, max_lines: int) -> List[str]:
+        """Read the complete lines available in the open log file.
+
+        The lines are read as bytes and only decoded once complete, so a
+        character that is partially written is not decoded before the rest
+        of it is available. Invalid UTF-8 bytes are replaced.
+
+        Args:
+            max_lines (int): maximum number of lines to read
+
+        Returns:
+            List[str]: lines read, including their line terminator
+        """
+        lines = []
+        while len(lines) < max_lines:
+            line = self.file.readline()
+            if not line:
+                break
+
+            if not line.endswith(b"\n"):
+                # Incomplete line, wait for the rest of it
+                self.partial_line += line
+                break
+
+            if line.endswith(b"\r\n"):
+                line = line[:-2] + b"\n"  # as text mode does
+
+            lines.append((self.partial_line + line).decode(errors="replace"))
+            self.partial_line = b""
+
+        return lines
+
+    def read_lines(self, max_lines: int = MAX_LINES_PER_READ) -> List[str]:
+        """Read the complete lines appended since the last call, without blocking.
+
+        When the log file is replaced (e.g., rotated) or truncated, the lines
+        left in the old file are read before the new file is opened.
+
+        Args:
+            max_lines (int, optional): maximum number of lines to read.
+                Defaults to MAX_LINES_PER_READ.
+
+        Returns:
+            List[str]: lines read, including their line terminator
+        """
+        if self.file is None and not self.__reopen_if_rotated():
+            return []
+
+        lines = self.__read_complete_lines(max_lines)
+        if not lines and self.__reopen_if_rotated():
+            lines = self.__read_complete_lines(max_lines)
+
+        return lines
+
+    def close(self):
+        """Close the log file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class SnapshotPublisher:
+    """A class used to share immutable snapshots of a LogParser's statistics."""
+
+    def __init__(self):
+        """Create a new SnapshotPublisher object holding empty statistics."""
+        self.snapshot = LogParser()
+
+    def publish(self, log_parser: LogParser):
+        """Publish a copy of the statistics gathered by a LogParser.
+
+        Args:
+            log_parser (LogParser): LogParser holding the statistics
+        """
+        # Replacing the reference is atomic, so readers always get a
+        # complete snapshot, which is never modified after published
+        self.snapshot = LogParser.from_dict(log_parser.to_dict())
+
+    def get_snapshot(self) -> LogParser:
+        """
+        Get the last published snapshot, which must not be modified.
+
+        Returns:
+            LogParser: LogParser holding the published statistics
+        """
+        return self.snapshot
+
+
+class StatsRequestHandler(BaseHTTPRequestHandler):
+    """A class used to serve the statistics published by a StatsDaemon."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Write the last published statistics in the requested format."""
+        endpoint = ENDPOINTS.get(self.path.split("?", 1)[0])
+        if endpoint is None:
+            self.send_error(404)
+            return
+
+        renderer, content_type = endpoint
+        snapshot = self.server.publisher.get_snapshot()
+
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.end_headers()
+
+        out = TextIOWrapper(self.wfile, encoding="utf-8")
+        renderer(snapshot, out)
+        out.flush()
+        out.detach()
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Do not log the requests."""
+
+
+class StatsDaemon:
+    """A class used to follow log files and serve their statistics over HTTP."""
+
+    def __init__(
+        self,
+        log_files: List[str],
+        log_line_format: str,
+        selected_charm_name: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        publish_interval: float = DEFAULT_PUBLISH_INTERVAL,
+    ):
+        """Create a new StatsDaemon object, binding its HTTP server.
+
+        Args:
+            log_files (List[str]): Paths of the log files to follow
+            log_line_format (str): Format of the log line
+            selected_charm_name (str, optional): Single charm to process
+            host (str, optional): address to listen on. Defaults to DEFAULT_HOST.
+            port (int, optional): port to listen on (0 picks a free port).
+                Defaults to DEFAULT_PORT.
+            poll_interval (float, optional): seconds to wait for new lines
+                when all files were read. Defaults to DEFAULT_POLL_INTERVAL.
+            publish_interval (float, optional): maximum seconds between
+                published snapshots. Defaults to DEFAULT_PUBLISH_INTERVAL.
+
+        Raises:
+            OSError: address cannot be bound
+        """
+        self.followers = [LogFollower(log_file) for log_file in log_files]
+        self.rejected = Counter()
+        self.errors = Counter()
+        self.record_parser = LogRecordParser(log_line_format, rejected=self.rejected)
+        self.selected_charm_name = selected_charm_name
+        self.poll_interval = poll_interval
+        self.publish_interval = publish_interval
+
+        self.log_parser = LogParser()
+        self.publisher = SnapshotPublisher()
+        self.stopped = Event()
+        self.threads = []
+
+        self.server = ThreadingHTTPServer((host, port), StatsRequestHandler)
+        self.server.daemon_threads = True
+        self.server.publisher = self.publisher
+
+    def get_server_address(self) -> Tuple[str, int]:
+        """
+        Get the address the HTTP server is listening on.
+
+        Returns:
+            Tuple[str, int]: host and port
+        """
+        return self.server.server_address[:2]
+
+    def get_rejected(self) -> Dict[str, int]:
+        """
+        Get the number of lines rejected by reason.
+
+        Returns:
+            Dict[str, int]: number of lines by reason
+        """
+        return dict(self.rejected)
+
+    def get_errors(self) -> Dict[str, int]:
+        """
+        Get the number of errors raised while ingesting the log files by type.
+
+        Returns:
+            Dict[str, int]: number of errors by exception name
+        """
+        return dict(self.errors)
+
+    def __selected_records(self, lines: Iterable[str]) -> Iterator[LogRecord]:
+        """Produce the log records to process from a batch of lines.
+
+        Args:
+            lines (Iterable[str]): log lines to parse
+        """
+        selected_charm_name = self.selected_charm_name
+        rejected = self.rejected
+
+        for record in self.record_parser.parse_lines(lines):
+            if record[1] not in INITIAL_BASE_STATS:
+                rejected[REJECTED_UNKNOWN_SEVERITY] += 1
+            elif selected_charm_name is None or record[0] == selected_charm_name:
+                yield record
+
+    def ingest(self) -> int:
+        """Process the lines appended to the log files since the last call.
+
+        Log records with an unsupported severity level (e.g., TRACE) are
+        rejected. An error raised while reading or processing the lines of a
+        log file is counted and written into stderr, so it does not stop the
+        ingestion of the other log files, nor of the next calls.
+
+        Returns:
+            int: number of lines read
+        """
+        n_lines = 0
+
+        for follower in self.followers:
+            try:
+                lines = follower.read_lines()
+                n_lines += len(lines)
+                self.log_parser.process_records(self.__selected_records(lines))
+            except Exception as ex:  # pylint: disable=broad-except
+                self.errors[type(ex).__name__] += 1
+                sys.stderr.write(f"Failed to ingest {follower.log_file}: {ex}\n")
+
+        return n_lines
+
+    def __ingestion_loop(self):
+        """Ingest new lines and publish snapshots until the daemon is stopped."""
+        last_publish = monotonic()
+        pending = False
+
+        while not self.stopped.is_set():
+            n_lines = self.ingest()
+            pending = pending or n_lines > 0
+
+            if pending and (
+                n_lines == 0 or monotonic() - last_publish >= self.publish_interval
+            ):
+                self.publisher.publish(self.log_parser)
+                last_publish = monotonic()
+                pending = False
+
+            if n_lines == 0:
+                self.stopped.wait(self.poll_interval)
+
+        for follower in self.followers:
+            follower.close()
+
+    def start(self):
+        """Start the ingestion and the HTTP server in background threads."""
+        self.threads = [
+            Thread(target=self.__ingestion_loop, daemon=True),
+            Thread(target=self.server.serve_forever, daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the daemon is stopped.
+
+        Args:
+            timeout (float, optional): maximum seconds to wait
+
+        Returns:
+            bool: the daemon was stopped
+        """
+        return self.stopped.wait(timeout)
+
+    def stop(self):
+        """Stop the ingestion and the HTTP server, and wait for their threads."""
+        self.stopped.set()
+        if self.threads:
+            self.server.shutdown()
+        self.server.server_close()
+
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+
+__all__ = [
+    "DEFAULT_HOST",
+    "DEFAULT_PORT",
+    "LogFollower",
+    "REJECTED_UNKNOWN_SEVERITY",
+    "SnapshotPublisher",
+    "StatsDaemon",
+    "StatsRequestHandler",
+]
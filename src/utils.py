@@ -1,7 +1,9 @@
 #!/usr/bin/python
 """This script contains a set of utility functions."""
 
-from typing import Dict, Optional
+import re
+from string import Formatter
+from typing import Callable, Dict, List, Optional, Tuple
 
 from parse import parse as parse_string
 
@@ -35,4 +37,112 @@ def unformat(string: str, pattern: str) -> Optional[Dict[str, str]]:
     return result.named if result is not None else None
 
 
-__all__ = ["unformat"]
+def compile_unformat(
+    pattern: str, fields: List[str]
+) -> Callable[[str], Optional[Tuple[str, ...]]]:
+    """Compile a pattern into a function that extracts some of its fields.
+
+    The returned function matches strings the same way as unformat, but it
+    returns a tuple with the values of the selected fields instead of a
+    dictionary with all of them. Only plain fields (e.g., "{name}") are
+    supported.
+
+    Args:
+        pattern (str): pattern to match strings against
+        fields (List[str]): names of the fields to extract, in order
+
+    Raises:
+        TypeError: pattern cannot be None
+        TypeError: fields cannot be None
+        ValueError: pattern has a field with a format spec or conversion
+        ValueError: pattern has a repeated field
+        ValueError: fields cannot be empty
+        ValueError: field not found in pattern
+
+    Returns:
+        Callable[[str], Optional[Tuple[str, ...]]]: function that returns the
+            values of the selected fields or None if there was no match
+    """
+    if pattern is None:
+        raise TypeError("pattern cannot be None")
+
+    if fields is None:
+        raise TypeError("fields cannot be None")
+
+    regex = []
+    groups = {}
+    for literal, name, spec, conversion in Formatter().parse(pattern):
+        regex.append(re.escape(literal))
+        if name is None:
+            continue
+
+        if spec or conversion:
+            raise ValueError(f"field {name} has a format spec or conversion")
+        if name in groups:
+            raise ValueError(f"field {name} is repeated")
+
+        regex.append("(.+?)")
+        groups[name or f"{len(groups)}"] = len(groups) + 1
+
+    if not fields:
+        raise ValueError("fields cannot be empty")
+
+    for name in fields:
+        if name not in groups:
+            raise ValueError(f"field {name} not found in pattern")
+
+    match = re.compile("".join(regex), re.IGNORECASE | re.DOTALL).fullmatch
+    indexes = [groups[name] for name in fields]
+
+    if len(indexes) == 1:
+        # Match.group does not return a tuple for a single group
+        indexes = indexes[0]
+
+        def unformat_fields(string: str) -> Optional[Tuple[str, ...]]:
+            result = match(string)
+            return (result.group(indexes),) if result is not None else None
+
+    else:
+
+        def unformat_fields(string: str) -> Optional[Tuple[str, ...]]:
+            result = match(string)
+            return result.group(*indexes) if result is not None else None
+
+    return unformat_fields
+
+
+def leading_field_separator(pattern: str) -> Optional[str]:
+    """Get the literal that separates the first field of a pattern from the rest.
+
+    For a pattern that starts with a field followed by a literal, such as
+    "{unit}: {message}", every matching string contains the literal (": ")
+    after its first character. This allows rejecting strings before trying
+    to match them, without rejecting any string that would match.
+
+    Args:
+        pattern (str): pattern to match strings against
+
+    Raises:
+        TypeError: pattern cannot be None
+
+    Returns:
+        Optional[str]: the literal or None if the pattern does not start with
+            a field followed by a literal, or if the literal has cased
+            characters (as strings are matched ignoring case)
+    """
+    if pattern is None:
+        raise TypeError("pattern cannot be None")
+
+    parsed = Formatter().parse(pattern)
+    first_literal, first_name, _, _ = next(parsed, ("", None, None, None))
+    if first_literal or first_name is None:
+        return None
+
+    separator, _, _, _ = next(parsed, ("", None, None, None))
+    if not separator or separator.lower() != separator.upper():
+        return None
+
+    return separator
+
+
+__all__ = ["compile_unformat", "leading_field_separator", "unformat"]
@@ -147,6 +147,42 @@ class LogParserTester(TestCase):
         juju_api_stats = log_parser.get_stats_for_charm("juju.api")
         self.assertDictEqual(juju_api_stats, juju_api_expected)
 
+    def test_records(self):
+        """Process log records the same way as parsed log entries."""
+        logs = SAMPLE_LOGS + [SAMPLE_LOGS[0]]
+        records = [
+            (log["charm_name"], log["severity_level"], log["message"]) for log in logs
+        ]
+
+        expected = LogParser()
+        expected.process_logs(logs)
+
+        log_parser = LogParser()
+        log_parser.process_records(iter(records))
+
+        self.assertDictEqual(log_parser.to_dict(), expected.to_dict())
+        self.assertSetEqual(
+            log_parser.get_processed_messages(), expected.get_processed_messages()
+        )
+
+    def test_none_state(self):
+        """Raise TypeError on None state."""
+        self.assertRaises(TypeError, LogParser.from_dict, None)
+
+    def test_to_dict_from_dict(self):
+        """Import the statistics exported by another LogParser."""
+        log_parser = LogParser()
+        log_parser.process_logs(SAMPLE_LOGS)
+
+        result = LogParser.from_dict(log_parser.to_dict())
+
+        self.assertDictEqual(result.to_dict(), log_parser.to_dict())
+        self.assertEqual(str(result), str(log_parser))
+
+        # The imported statistics are not shared with the exporter
+        log_parser.process_log(SAMPLE_LOGS[0])
+        self.assertNotEqual(str(result), str(log_parser))
+
     # Necessário testar o process_logs ? --> é só um ciclo a chamar o process_log para cada log
 
 
@@ -0,0 +1,187 @@
+"""This file contains the implementation of a tester class for log_records.py."""
+
+from collections import Counter
+from unittest import TestCase, main
+
+from log_parser import LogParser
+from log_records import (
+    REJECTED_EMPTY,
+    REJECTED_MALFORMED,
+    REJECTED_NO_UNIT_PREFIX,
+    LogRecordParser,
+)
+from utils import unformat
+
+# Constants
+DEFAULT_LOG_LINE_FORMAT = (
+    "{unit}: {hour}:{minutes}:{seconds} {severity_level} {charm_name} {message}\n"
+)
+
+LOG_LINES = [
+    "machine-0: 01:56:55 ERROR juju.worker panic: runtime error\n",
+    "goroutine 1 [running]:\n",
+    "\tmain.main()\n",
+    "\n",
+    "machine-0: 01:56:56 INFO juju.cmd running jujud\n",
+    "machine-0: malformed\n",
+]
+
+RECORD_0 = ("juju.worker", "ERROR", "panic: runtime error")
+
+RECORD_1 = ("juju.cmd", "INFO", "running jujud")
+
+PYTHON_TRACEBACK = """unit-app-0: 01:56:57 ERROR juju.worker.uniter hook failed
+Traceback (most recent call last):
+  File "./src/charm.py", line 42, in _on_config_changed
+    self._configure()
+ValueError: {error}
+
+"""
+
+GO_PANIC = """machine-0: 01:56:58 ERROR juju.worker.dependency worker crashed
+panic: runtime error: {error}
+
+goroutine 1 [running]:
+main.main()
+\t/build/cmd/jujud/main.go:12 +0x1d
+"""
+
+
+class LogRecordParserTester(TestCase):
+    """Tester class used for testing the LogRecordParser class."""
+
+    def test_single_line(self):
+        """Produce one record per valid line and count the rejected lines."""
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT)
+        records = list(record_parser.parse_lines(LOG_LINES))
+
+        self.assertListEqual(records, [RECORD_0, RECORD_1])
+        self.assertDictEqual(
+            record_parser.get_rejected(),
+            {REJECTED_NO_UNIT_PREFIX: 2, REJECTED_EMPTY: 1, REJECTED_MALFORMED: 1},
+        )
+
+    def test_same_as_unformat(self):
+        """Accept the same lines as unformat, such as a unit with a space."""
+        lines = [
+            "unit 0: 01:02:03 DEBUG juju.cmd unit with space\n",
+            "  machine-0: 01:02:03 DEBUG juju.cmd leading whitespace\n",
+        ] + LOG_LINES
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT)
+
+        logs = (unformat(line, DEFAULT_LOG_LINE_FORMAT) for line in lines)
+        expected = [
+            (log["charm_name"], log["severity_level"], log["message"])
+            for log in logs
+            if log is not None
+        ]
+        self.assertListEqual(list(record_parser.parse_lines(lines)), expected)
+
+    def test_multiline(self):
+        """Attach the continuation lines to the message of the previous record."""
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT, multiline=True)
+        records = list(record_parser.parse_lines(LOG_LINES))
+
+        message_0 = "panic: runtime error\ngoroutine 1 [running]:\n\tmain.main()"
+        message_1 = "running jujud\nmachine-0: malformed"
+        self.assertListEqual(
+            records, [RECORD_0[:2] + (message_0,), RECORD_1[:2] + (message_1,)]
+        )
+        self.assertDictEqual(record_parser.get_rejected(), {REJECTED_EMPTY: 1})
+        self.assertEqual(record_parser.get_continuation_lines(), 3)
+
+    def test_multiline_python_traceback(self):
+        """Keep the exception line of a traceback in the message."""
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT, multiline=True)
+        lines = PYTHON_TRACEBACK.format(error="bad thing").splitlines(True)
+        records = list(record_parser.parse_lines(lines))
+
+        self.assertEqual(len(records), 1)
+        message = records[0][2]
+        self.assertTrue(message.startswith("hook failed\nTraceback"))
+        self.assertTrue(message.endswith("\nValueError: bad thing"))
+
+    def test_multiline_go_panic(self):
+        """Keep the panic line of a Go stack trace in the message."""
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT, multiline=True)
+        lines = GO_PANIC.format(error="index out of range").splitlines(True)
+        records = list(record_parser.parse_lines(lines))
+
+        self.assertListEqual(
+            [message.splitlines() for _, _, message in records],
+            [
+                [
+                    "worker crashed",
+                    "panic: runtime error: index out of range",
+                    "goroutine 1 [running]:",
+                    "main.main()",
+                    "\t/build/cmd/jujud/main.go:12 +0x1d",
+                ]
+            ],
+        )
+        self.assertDictEqual(record_parser.get_rejected(), {REJECTED_EMPTY: 1})
+        self.assertEqual(record_parser.get_continuation_lines(), 4)
+
+    def test_multiline_different_errors(self):
+        """Count the same stack with different errors as different messages."""
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT, multiline=True)
+        log_parser = LogParser()
+        content = "".join(
+            template.format(error=error)
+            for template in (PYTHON_TRACEBACK, GO_PANIC)
+            for error in ("first", "second", "first")
+        )
+        log_parser.process_records(record_parser.parse_lines(content.splitlines(True)))
+
+        stats = log_parser.get_global_stats()
+        self.assertEqual(stats["all"]["ERROR"], 6)
+        self.assertEqual(stats["duplicates"]["ERROR"], 2)
+
+    def test_multiline_empty_lines(self):
+        """Produce the same message whether an empty line follows it or not."""
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT, multiline=True)
+        records = list(record_parser.parse_lines(LOG_LINES[:3] + ["\n", "  \n"]))
+
+        self.assertListEqual(records, list(record_parser.parse_lines(LOG_LINES[:3])))
+
+    def test_multiline_leading_lines(self):
+        """Reject the continuation lines that precede the first record."""
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT, multiline=True)
+        records = list(record_parser.parse_lines(LOG_LINES[1:3]))
+
+        self.assertListEqual(records, [])
+        self.assertDictEqual(record_parser.get_rejected(), {REJECTED_NO_UNIT_PREFIX: 2})
+
+    def test_multiline_duplicates(self):
+        """Count a repeated multi-line message as a duplicate of the whole entry."""
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT, multiline=True)
+        log_parser = LogParser()
+        log_parser.process_records(record_parser.parse_lines(LOG_LINES[:3] * 2))
+
+        stats = log_parser.get_stats_for_charm("juju.worker")
+        self.assertEqual(stats["all"]["ERROR"], 2)
+        self.assertEqual(stats["duplicates"]["ERROR"], 1)
+
+    def test_shared_counter(self):
+        """Update the given counter of rejected lines."""
+        rejected = Counter({REJECTED_EMPTY: 1})
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT, rejected=rejected)
+        list(record_parser.parse_lines(["\n"]))
+
+        self.assertEqual(rejected[REJECTED_EMPTY], 2)
+
+    def test_no_unit_prefix_format(self):
+        """Match every line when the format does not start with a unit."""
+        record_parser = LogRecordParser(
+            "[{severity_level}] {charm_name} {message}\n"
+        )
+        records = list(record_parser.parse_lines(["[INFO] juju.cmd up\n", "up\n"]))
+
+        self.assertListEqual(records, [("juju.cmd", "INFO", "up")])
+        self.assertDictEqual(record_parser.get_rejected(), {REJECTED_MALFORMED: 1})
+
+
+if __name__ == "__main__":
+    main()
+
+__all__ = ["LogRecordParserTester"]
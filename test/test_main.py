@@ -1,14 +1,18 @@
 """This file contains the implementation of a tester class for main.py."""
 
 import errno
+import json
 import os
 from io import StringIO
+from tempfile import TemporaryDirectory
 from unittest import TestCase, main
 from unittest.mock import mock_open, patch
 
-from main import DEFAULT_LOG_LINE_FORMAT, log_file_reader
+from log_records import LogRecordParser
+from main import DEFAULT_LOG_LINE_FORMAT, log_file_reader, log_record_reader
 from main import main as app_main
-from main import parse_args, to_process_log
+from main import parse_args, parse_options, to_process_log
+from result_cache import CACHE_DIR_ENV_VAR
 
 # Constants
 LOG_FILE_1 = """controller-0: 01:47:48 INFO juju.worker.logger logger worker started
@@ -74,6 +78,16 @@ OUT_2 = """juju.cmd:
 OUT_3 = """[Errno 2] No such file or directory: '%s'
 """
 
+OUT_4 = """Rejected lines:
+  empty: 1
+  no_unit_prefix: 1
+"""
+
+OUT_5 = """Rejected lines:
+  empty: 1
+Continuation lines: 1
+"""
+
 
 class ToProcessLogTester(TestCase):
     """Tester class used for testing the to_process_log function."""
@@ -127,6 +141,56 @@ class LogFileReader(TestCase):
             mock_file.assert_called_with(log_file_path, mode="r")
 
 
+class LogRecordReader(TestCase):
+    """Tester class used for testing the log_record_reader function."""
+
+    def test_mock_file(self):
+        """Read two valid log records from a mock file."""
+        mock_file = mock_open(read_data=LOG_FILE_1 + "    continuation line\n")
+
+        log_file_path = "path/to/open"
+        expected = [
+            (log["charm_name"], log["severity_level"], log["message"])
+            for log in (LOG_SAMPLE_0, LOG_SAMPLE_1)
+        ]
+
+        with patch("builtins.open", mock_file):
+            log_reader = log_record_reader(log_file_path, DEFAULT_LOG_LINE_FORMAT)
+            result = [record for record in log_reader]
+
+            self.assertListEqual(result, expected)
+            mock_file.assert_called_with(log_file_path, mode="r")
+
+    def test_selected_charm(self):
+        """Read only the log records of the selected charm from a mock file."""
+        mock_file = mock_open(read_data=LOG_FILE_1)
+
+        with patch("builtins.open", mock_file):
+            log_reader = log_record_reader(
+                "path/to/open", DEFAULT_LOG_LINE_FORMAT, "juju.cmd"
+            )
+            result = [record[0] for record in log_reader]
+
+            self.assertListEqual(result, ["juju.cmd"])
+
+    def test_multiline(self):
+        """Attach the continuation lines to the previous log record."""
+        mock_file = mock_open(read_data=LOG_FILE_1 + "    continuation line\n")
+        record_parser = LogRecordParser(DEFAULT_LOG_LINE_FORMAT, multiline=True)
+
+        with patch("builtins.open", mock_file):
+            log_reader = log_record_reader(
+                "path/to/open", DEFAULT_LOG_LINE_FORMAT, "juju.cmd", record_parser
+            )
+            result = [record[2] for record in log_reader]
+
+            self.assertListEqual(
+                result, [LOG_SAMPLE_1["message"] + "\n    continuation line"]
+            )
+            self.assertDictEqual(record_parser.get_rejected(), {})
+            self.assertEqual(record_parser.get_continuation_lines(), 1)
+
+
 class ParseArgsTester(TestCase):
     """Tester class used for testing the parse_args function."""
 
@@ -157,6 +221,44 @@ class ParseArgsTester(TestCase):
         self.assertTupleEqual(result, expected)
 
 
+class ParseOptionsTester(TestCase):
+    """Tester class used for testing the parse_options function."""
+
+    def test_none_args(self):
+        """Raise TypeError when the args are None."""
+        self.assertRaises(TypeError, parse_options, None)
+
+    def test_no_options(self):
+        """Return all arguments when there are no options."""
+        args = ["arg0", "arg1", "arg2"]
+        result = parse_options(args)
+        self.assertTupleEqual(result, ({}, args))
+
+    def test_flag(self):
+        """Split a flag from the arguments."""
+        args = ["arg0", "--no-cache", "arg1"]
+        result = parse_options(args)
+        self.assertTupleEqual(result, ({"no-cache": True}, ["arg0", "arg1"]))
+
+    def test_unknown_option(self):
+        """Raise TypeError on an unknown option."""
+        self.assertRaises(TypeError, parse_options, ["arg0", "--unknown", "arg1"])
+
+    def test_flag_with_value(self):
+        """Raise TypeError when a flag is given a value."""
+        self.assertRaises(TypeError, parse_options, ["arg0", "--no-cache=yes"])
+
+    def test_option_with_value(self):
+        """Split an option with a value from the arguments."""
+        args = ["arg0", "--merge=a.log,b.log", "arg1"]
+        result = parse_options(args)
+        self.assertTupleEqual(result, ({"merge": "a.log,b.log"}, ["arg0", "arg1"]))
+
+    def test_option_without_value(self):
+        """Raise TypeError when an option that requires a value has none."""
+        self.assertRaises(TypeError, parse_options, ["arg0", "--merge"])
+
+
 class MainTester(TestCase):
     """Tester class used for testing the main function."""
 
@@ -223,6 +325,248 @@ class MainTester(TestCase):
                 self.assertEqual(out, OUT_2)
             mock_file.assert_called_with(log_file_path, mode="r")
 
+    def test_cached_file(self):
+        """Process a file twice, the second time from the result cache."""
+        with TemporaryDirectory() as tmp_dir:
+            log_file_path = os.path.join(tmp_dir, "juju-debug.log")
+            with open(log_file_path, mode="w") as log_file:
+                log_file.write(LOG_FILE_1)
+
+            argv = ["path/to/main", log_file_path]
+            cache_dir = os.path.join(tmp_dir, "cache")
+
+            with patch.dict(os.environ, {CACHE_DIR_ENV_VAR: cache_dir}):
+                for _ in range(2):
+                    with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                        status = app_main(argv)
+                        self.assertEqual(status, 0)
+                        self.assertEqual(mock_out.getvalue(), OUT_1)
+
+                with patch("main.log_record_reader") as mock_reader:
+                    with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                        status = app_main(argv)
+                        self.assertEqual(mock_out.getvalue(), OUT_1)
+                    mock_reader.assert_not_called()
+
+                with patch("main.log_record_reader") as mock_reader:
+                    with patch("sys.stdout", new_callable=StringIO):
+                        app_main(["path/to/main", "--no-cache", log_file_path])
+                    mock_reader.assert_called_once()
+
+            self.assertTrue(os.path.isdir(cache_dir))
+
+    def test_unknown_format(self):
+        """Launch main with an unknown format, returns an error."""
+        argv = ["path/to/main", "--format=xml", "path/to/open"]
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_out:
+            status = app_main(argv)
+            self.assertEqual(status, -1)
+            self.assertTrue(mock_out.getvalue().startswith("Unknown format: xml\n"))
+
+    def test_json_format(self):
+        """Process a mock file with two log entries into JSON."""
+        mock_file = mock_open(read_data=LOG_FILE_1)
+        argv = ["path/to/main", "--format=json", "path/to/open", "juju.cmd"]
+
+        with patch("builtins.open", mock_file):
+            with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                status = app_main(argv)
+                result = json.loads(mock_out.getvalue())
+
+                self.assertEqual(status, 0)
+                self.assertListEqual(list(result["per_charm"]), ["juju.cmd"])
+                self.assertEqual(result["global"]["all"]["INFO"], 1)
+
+    def test_mem_report(self):
+        """Process a mock file and print the memory report into stderr."""
+        mock_file = mock_open(read_data=LOG_FILE_1)
+        argv = ["path/to/main", "--mem-report", "path/to/open"]
+
+        with patch("builtins.open", mock_file):
+            with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                with patch("sys.stderr", new_callable=StringIO) as mock_err:
+                    status = app_main(argv)
+
+                    self.assertEqual(status, 0)
+                    self.assertEqual(mock_out.getvalue(), OUT_1)
+                    self.assertTrue(mock_err.getvalue().startswith("Memory:\n"))
+                    self.assertIn("  unique_messages: 2\n", mock_err.getvalue())
+
+    def test_cached_mem_report(self):
+        """Measure the unique messages of a cached file by reading it again."""
+        with TemporaryDirectory() as tmp_dir:
+            log_file_path = os.path.join(tmp_dir, "juju-debug.log")
+            with open(log_file_path, mode="w") as log_file:
+                log_file.write(LOG_FILE_1)
+
+            with patch.dict(os.environ, {CACHE_DIR_ENV_VAR: tmp_dir}):
+                for argv in (
+                    ["path/to/main", log_file_path],
+                    ["path/to/main", "--mem-report", log_file_path],
+                ):
+                    with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                        with patch("sys.stderr", new_callable=StringIO) as mock_err:
+                            status = app_main(argv)
+                            self.assertEqual(status, 0)
+                            self.assertEqual(mock_out.getvalue(), OUT_1)
+
+                self.assertIn("  unique_messages: 2\n", mock_err.getvalue())
+
+    def test_invalid_port(self):
+        """Launch main with an invalid port, returns an error."""
+        argv = ["path/to/main", "--daemon", "--port=http", "path/to/open"]
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_out:
+            status = app_main(argv)
+            self.assertEqual(status, -1)
+            self.assertTrue(mock_out.getvalue().startswith("Invalid port: http\n"))
+
+    def test_daemon(self):
+        """Serve the statistics of a file on localhost until interrupted."""
+        with TemporaryDirectory() as tmp_dir:
+            log_file_path = os.path.join(tmp_dir, "juju-debug.log")
+            argv = ["path/to/main", "--daemon", "--port=0", log_file_path]
+
+            with patch("stats_server.StatsDaemon.wait", side_effect=KeyboardInterrupt):
+                with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                    status = app_main(argv)
+
+                    self.assertEqual(status, 0)
+                    self.assertRegex(
+                        mock_out.getvalue(),
+                        r"^Serving statistics on http://127\.0\.0\.1:\d+"
+                        r"/stats and /metrics\n$",
+                    )
+
+    def test_rotated_files(self):
+        """Process a log file merged with its backup and another log file."""
+        with TemporaryDirectory() as tmp_dir:
+            log_file_path = os.path.join(tmp_dir, "machine-0.log")
+            with open(log_file_path + ".1", mode="w") as log_file:
+                log_file.write(LOG_FILE_1.splitlines(True)[0])
+            with open(log_file_path, mode="w") as log_file:
+                log_file.write(LOG_FILE_1.splitlines(True)[1])
+
+            other_file_path = os.path.join(tmp_dir, "all-machines.log")
+            with open(other_file_path, mode="w") as log_file:
+                log_file.write(LOG_FILE_1)
+
+            argv = [
+                "path/to/main",
+                "--no-cache",
+                "--rotated",
+                f"--merge={other_file_path}",
+                log_file_path,
+            ]
+
+            with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                status = app_main(argv)
+                self.assertEqual(status, 0)
+                self.assertEqual(mock_out.getvalue(), OUT_1)
+
+    def test_parse_errors(self):
+        """Process a mock file and print the rejected lines into stderr."""
+        mock_file = mock_open(read_data=LOG_FILE_1 + "\n    continuation line\n")
+        argv = ["path/to/main", "--no-cache", "--parse-errors", "path/to/open"]
+
+        with patch("builtins.open", mock_file):
+            with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                with patch("sys.stderr", new_callable=StringIO) as mock_err:
+                    status = app_main(argv)
+
+                    self.assertEqual(status, 0)
+                    self.assertEqual(mock_out.getvalue(), OUT_1)
+                    self.assertEqual(mock_err.getvalue(), OUT_4)
+
+    def test_multiline_parse_errors(self):
+        """Print the continuation lines apart from the rejected lines."""
+        mock_file = mock_open(read_data=LOG_FILE_1 + "\n    continuation line\n")
+        argv = [
+            "path/to/main",
+            "--no-cache",
+            "--multiline",
+            "--parse-errors",
+            "path/to/open",
+        ]
+
+        with patch("builtins.open", mock_file):
+            with patch("sys.stdout", new_callable=StringIO):
+                with patch("sys.stderr", new_callable=StringIO) as mock_err:
+                    status = app_main(argv)
+
+                    self.assertEqual(status, 0)
+                    self.assertEqual(mock_err.getvalue(), OUT_5)
+
+    def test_single_file_options(self):
+        """Launch main with --multiline and --merge, returns an error."""
+        argv = ["path/to/main", "--multiline", "--merge=path/to/other", "path/to/open"]
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_out:
+            status = app_main(argv)
+            self.assertEqual(status, -1)
+            self.assertTrue(
+                mock_out.getvalue().startswith(
+                    "Option --multiline requires a single log file\n"
+                )
+            )
+
+    def test_daemon_options(self):
+        """Launch main with --parse-errors and --daemon, returns an error."""
+        argv = ["path/to/main", "--daemon", "--parse-errors", "path/to/open"]
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_out:
+            status = app_main(argv)
+            self.assertEqual(status, -1)
+            self.assertTrue(
+                mock_out.getvalue().startswith(
+                    "Option --parse-errors cannot be used with --daemon\n"
+                )
+            )
+
+    def test_cached_rotated_and_merged_files(self):
+        """Do not share the cache entry of reading files in sequence and merged."""
+        with TemporaryDirectory() as tmp_dir:
+            log_file_path = os.path.join(tmp_dir, "m.log")
+            with open(log_file_path + ".1", mode="w") as log_file:
+                log_file.write("machine-0: 10:00:01 INFO juju.cmd a\n")
+            with open(log_file_path, mode="w") as log_file:
+                log_file.write(
+                    "machine-0: 10:00:01 INFO juju.cmd b\n"
+                    "machine-0: 10:00:01 INFO juju.cmd a\n"
+                )
+
+            rotated_argv = ["path/to/main", "--rotated", "--format=json", log_file_path]
+            merged_argv = [
+                "path/to/main",
+                f"--merge={log_file_path}",
+                "--format=json",
+                log_file_path + ".1",
+            ]
+
+            with patch.dict(os.environ, {CACHE_DIR_ENV_VAR: tmp_dir}):
+                totals = []
+                for argv in (rotated_argv, merged_argv, rotated_argv):
+                    with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                        self.assertEqual(app_main(argv), 0)
+                        totals.append(json.loads(mock_out.getvalue())["global"])
+
+            self.assertListEqual(
+                [(t["all"]["INFO"], t["duplicates"]["INFO"]) for t in totals],
+                [(3, 1), (2, 0), (3, 1)],
+            )
+
+    def test_non_existing_rotated_file(self):
+        """Try to process the backups of a file that does not exist."""
+        with TemporaryDirectory() as tmp_dir:
+            log_file_path = os.path.join(tmp_dir, "machine-0.log")
+            argv = ["path/to/main", "--rotated", log_file_path]
+
+            with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                status = app_main(argv)
+                self.assertEqual(status, -1)
+                self.assertEqual(mock_out.getvalue(), OUT_3 % (log_file_path))
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,153 @@
+"""This file contains the implementation of tester classes for mem_profile.py."""
+
+import sys
+from io import StringIO
+from unittest import TestCase, main
+
+from mem_profile import (
+    deep_size,
+    generate_log_lines,
+    peak_rss,
+    profile_log_parser,
+    profile_stage,
+    write_mem_report,
+)
+from utils import compile_unformat, unformat
+
+# Constants
+DEFAULT_LOG_LINE_FORMAT = (
+    "{unit}: {hour}:{minutes}:{seconds} {severity_level} {charm_name} {message}\n"
+)
+
+N_LINES = 20000
+
+N_STAGE_LINES = 5000
+
+# Memory budgets, in bytes, for the generated lines (48 characters messages)
+BYTES_PER_UNIQUE_MESSAGE_BUDGET = 256
+
+BYTES_PER_CHARM_BUDGET = 800
+
+BYTES_PER_PARSED_LOG_BUDGET = 1200
+
+BYTES_PER_LOG_RECORD_BUDGET = 400
+
+STAGE_PEAK_BUDGET = 64 * 1024
+
+
+class GenerateLogLinesTester(TestCase):
+    """Tester class used for testing the generate_log_lines function."""
+
+    def test_deterministic(self):
+        """Produce the same lines for the same seed."""
+        self.assertListEqual(
+            list(generate_log_lines(100)), list(generate_log_lines(100))
+        )
+
+    def test_valid_lines(self):
+        """Produce lines that match the default log line format."""
+        for line in generate_log_lines(100, n_charms=3):
+            log = unformat(line, DEFAULT_LOG_LINE_FORMAT)
+            self.assertIsNotNone(log)
+            self.assertIn(
+                log["charm_name"], ("juju.charm-0", "juju.charm-1", "juju.charm-2")
+            )
+
+    def test_duplicate_ratio(self):
+        """Produce only unique messages when there are no duplicates."""
+        lines = [
+            line.split(" ", 2)[2]
+            for line in generate_log_lines(100, duplicate_ratio=0)
+        ]
+        self.assertEqual(len(set(lines)), 100)
+
+
+class DeepSizeTester(TestCase):
+    """Tester class used for testing the deep_size function."""
+
+    def test_nested(self):
+        """Count the size of the values held by containers."""
+        value = "x" * 100
+        expected = sys.getsizeof([]) + sys.getsizeof({}) + sys.getsizeof(value)
+        self.assertEqual(deep_size({}), sys.getsizeof({}))
+        self.assertGreaterEqual(deep_size([{"k": value}]), expected)
+
+    def test_shared(self):
+        """Count shared objects only once."""
+        value = "x" * 100
+        self.assertEqual(
+            deep_size([value, value]),
+            sys.getsizeof([value, value]) + sys.getsizeof(value),
+        )
+
+
+class WriteMemReportTester(TestCase):
+    """Tester class used for testing the write_mem_report function."""
+
+    def test_report(self):
+        """Write one line per measure."""
+        out = StringIO()
+        report = {"charms": 2, "bytes_per_charm": 10.25, "peak_rss_bytes": None}
+        write_mem_report(report, out)
+        expected = (
+            "Memory:\n  charms: 2\n  bytes_per_charm: 10.2\n  peak_rss_bytes: n/a\n"
+        )
+        self.assertEqual(out.getvalue(), expected)
+
+
+class MemoryBudgetTester(TestCase):
+    """Tester class used for checking the memory used against a budget."""
+
+    def test_log_parser(self):
+        """Keep the memory held by a LogParser under budget."""
+        lines = generate_log_lines(N_LINES)
+        logs = [unformat(line, DEFAULT_LOG_LINE_FORMAT) for line in lines]
+        report = profile_log_parser(logs)
+
+        self.assertGreater(report["unique_messages"], 0)
+        self.assertLessEqual(
+            report["bytes_per_unique_message"], BYTES_PER_UNIQUE_MESSAGE_BUDGET
+        )
+        self.assertLessEqual(
+            report["traced_bytes_per_unique_message"], BYTES_PER_UNIQUE_MESSAGE_BUDGET
+        )
+        self.assertLessEqual(report["bytes_per_charm"], BYTES_PER_CHARM_BUDGET)
+
+    def test_parse_stage(self):
+        """Keep the parsed logs under budget and stream them in constant memory."""
+        lines = list(generate_log_lines(N_STAGE_LINES))
+        logs = (unformat(line, DEFAULT_LOG_LINE_FORMAT) for line in lines)
+        report = profile_stage(logs)
+
+        self.assertEqual(report["entries"], N_STAGE_LINES)
+        self.assertLessEqual(report["bytes_per_entry"], BYTES_PER_PARSED_LOG_BUDGET)
+        self.assertLessEqual(report["traced_peak_bytes"], STAGE_PEAK_BUDGET)
+
+    def test_record_stage(self):
+        """Keep the log records under budget and stream them in constant memory."""
+        unformat_record = compile_unformat(
+            DEFAULT_LOG_LINE_FORMAT, ["charm_name", "severity_level", "message"]
+        )
+        lines = list(generate_log_lines(N_STAGE_LINES))
+        report = profile_stage(map(unformat_record, lines))
+
+        self.assertEqual(report["entries"], N_STAGE_LINES)
+        self.assertLessEqual(report["bytes_per_entry"], BYTES_PER_LOG_RECORD_BUDGET)
+        self.assertLessEqual(report["traced_peak_bytes"], STAGE_PEAK_BUDGET)
+
+    def test_peak_rss(self):
+        """Measure a positive peak RSS where supported."""
+        result = peak_rss()
+        if result is not None:
+            self.assertGreater(result, 0)
+
+
+if __name__ == "__main__":
+    main()
+
+__all__ = [
+    "DeepSizeTester",
+    "GenerateLogLinesTester",
+    "MemoryBudgetTester",
+    "WriteMemReportTester",
+]
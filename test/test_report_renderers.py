@@ -0,0 +1,104 @@
+"""This file contains the implementation of a tester class for report_renderers.py."""
+
+import csv
+import json
+from io import StringIO
+from unittest import TestCase, main
+
+from log_parser import LogParser
+from report_renderers import render_report
+
+# Constants
+SAMPLE_LOGS = [
+    {"charm_name": "juju.network", "severity_level": "INFO", "message": "up"},
+    {"charm_name": "juju.network", "severity_level": "INFO", "message": "up"},
+    {"charm_name": 'juju."api"', "severity_level": "ERROR", "message": "down"},
+]
+
+OUT_PROMETHEUS = """# HELP juju_log_messages_total Number of log messages.
+# TYPE juju_log_messages_total counter
+juju_log_messages_total{severity="INFO"} 2
+juju_log_messages_total{severity="DEBUG"} 0
+juju_log_messages_total{severity="WARNING"} 0
+juju_log_messages_total{severity="ERROR"} 1
+# HELP juju_log_duplicate_messages_total Number of duplicate log messages.
+# TYPE juju_log_duplicate_messages_total counter
+juju_log_duplicate_messages_total{severity="INFO"} 1
+juju_log_duplicate_messages_total{severity="DEBUG"} 0
+juju_log_duplicate_messages_total{severity="WARNING"} 0
+juju_log_duplicate_messages_total{severity="ERROR"} 0
+# HELP juju_log_charm_messages_total Number of log messages per charm.
+# TYPE juju_log_charm_messages_total counter
+juju_log_charm_messages_total{charm="juju.network",severity="INFO"} 2
+juju_log_charm_messages_total{charm="juju.network",severity="DEBUG"} 0
+juju_log_charm_messages_total{charm="juju.network",severity="WARNING"} 0
+juju_log_charm_messages_total{charm="juju.network",severity="ERROR"} 0
+juju_log_charm_messages_total{charm="juju.\\"api\\"",severity="INFO"} 0
+juju_log_charm_messages_total{charm="juju.\\"api\\"",severity="DEBUG"} 0
+juju_log_charm_messages_total{charm="juju.\\"api\\"",severity="WARNING"} 0
+juju_log_charm_messages_total{charm="juju.\\"api\\"",severity="ERROR"} 1
+# HELP juju_log_charm_duplicate_messages_total Number of duplicate log messages per charm.
+# TYPE juju_log_charm_duplicate_messages_total counter
+juju_log_charm_duplicate_messages_total{charm="juju.network",severity="INFO"} 1
+juju_log_charm_duplicate_messages_total{charm="juju.network",severity="DEBUG"} 0
+juju_log_charm_duplicate_messages_total{charm="juju.network",severity="WARNING"} 0
+juju_log_charm_duplicate_messages_total{charm="juju.network",severity="ERROR"} 0
+juju_log_charm_duplicate_messages_total{charm="juju.\\"api\\"",severity="INFO"} 0
+juju_log_charm_duplicate_messages_total{charm="juju.\\"api\\"",severity="DEBUG"} 0
+juju_log_charm_duplicate_messages_total{charm="juju.\\"api\\"",severity="WARNING"} 0
+juju_log_charm_duplicate_messages_total{charm="juju.\\"api\\"",severity="ERROR"} 0
+"""
+
+
+# Auxiliary Function
+def render(log_parser: LogParser, report_format: str) -> str:
+    out = StringIO()
+    render_report(log_parser, out, report_format)
+    return out.getvalue()
+
+
+class RenderReportTester(TestCase):
+    """Tester class used for testing the render_report function."""
+
+    def setUp(self):
+        self.log_parser = LogParser()
+        self.log_parser.process_logs(SAMPLE_LOGS)
+
+    def test_unknown_format(self):
+        """Raise ValueError on an unknown format."""
+        self.assertRaises(ValueError, render, self.log_parser, "xml")
+
+    def test_text(self):
+        """Write the same report as print."""
+        for log_parser in (LogParser(), self.log_parser):
+            self.assertEqual(render(log_parser, "text"), f"{log_parser}\n")
+
+    def test_json(self):
+        """Write the same statistics as to_dict."""
+        result = json.loads(render(self.log_parser, "json"))
+        self.assertDictEqual(result, self.log_parser.to_dict())
+
+    def test_empty_json(self):
+        """Write a valid document when there are no statistics."""
+        result = json.loads(render(LogParser(), "json"))
+        self.assertDictEqual(result, LogParser().to_dict())
+
+    def test_csv(self):
+        """Write one row per charm and severity level."""
+        rows = list(csv.reader(StringIO(render(self.log_parser, "csv"))))
+
+        self.assertListEqual(rows[0], ["charm", "severity", "messages", "duplicates"])
+        self.assertEqual(len(rows), 1 + 3 * 4)
+        self.assertListEqual(rows[1], ["", "INFO", "2", "1"])
+        self.assertListEqual(rows[5], ["juju.network", "INFO", "2", "1"])
+        self.assertListEqual(rows[12], ['juju."api"', "ERROR", "1", "0"])
+
+    def test_prometheus(self):
+        """Write the metrics with escaped label values."""
+        self.assertEqual(render(self.log_parser, "prometheus"), OUT_PROMETHEUS)
+
+
+if __name__ == "__main__":
+    main()
+
+__all__ = ["RenderReportTester", "SAMPLE_LOGS"]
@@ -0,0 +1,205 @@
+"""This file contains the implementation of a tester class for result_cache.py."""
+
+import os
+from threading import Thread
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from log_parser import LogParser
+from result_cache import ResultCache, sample_hash
+
+# Constants
+LOG_FILE_1 = """controller-0: 01:47:48 INFO juju.worker.logger logger worker started
+machine-0: 01:56:55 INFO juju.cmd running jujud
+machine-0: 01:56:56 INFO juju.cmd running jujud
+"""
+
+PARAMS_1 = {"charm": None, "format": "text"}
+
+
+# Auxiliary Function
+def new_log_parser() -> LogParser:
+    log_parser = LogParser()
+    log_parser.process_log(
+        {"charm_name": "juju.cmd", "severity_level": "INFO", "message": "running"}
+    )
+    log_parser.process_log(
+        {"charm_name": "juju.cmd", "severity_level": "INFO", "message": "running"}
+    )
+    return log_parser
+
+
+class SampleHashTester(TestCase):
+    """Tester class used for testing the sample_hash function."""
+
+    def test_same_content(self):
+        """Return the same digest for files with the same content."""
+        with TemporaryDirectory() as tmp_dir:
+            paths = [os.path.join(tmp_dir, name) for name in ("a.log", "b.log")]
+            for path in paths:
+                with open(path, mode="w") as file:
+                    file.write(LOG_FILE_1)
+
+            size = len(LOG_FILE_1)
+            self.assertEqual(sample_hash(paths[0], size), sample_hash(paths[1], size))
+
+    def test_sampled_regions(self):
+        """Only the sampled regions of large files affect the digest."""
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "a.log")
+            content = bytearray(b"x" * 100)
+
+            with open(path, mode="wb") as file:
+                file.write(content)
+            before = sample_hash(path, len(content), sample_size=10)
+
+            content[20] = ord("y")  # outside of the sampled regions
+            with open(path, mode="wb") as file:
+                file.write(content)
+            self.assertEqual(sample_hash(path, len(content), sample_size=10), before)
+
+            content[50] = ord("y")  # inside the middle sample
+            with open(path, mode="wb") as file:
+                file.write(content)
+            self.assertNotEqual(sample_hash(path, len(content), sample_size=10), before)
+
+
+class ResultCacheTester(TestCase):
+    """Tester class used for testing the ResultCache class."""
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        self.log_file = os.path.join(self.tmp_dir.name, "juju-debug.log")
+        with open(self.log_file, mode="w") as file:
+            file.write(LOG_FILE_1)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_none_cache_dir(self):
+        """Raise TypeError on None cache directory."""
+        self.assertRaises(TypeError, ResultCache, None)
+
+    def test_missing_file(self):
+        """Raise OSError when computing the key of a missing file."""
+        self.assertRaises(
+            OSError, ResultCache.make_key, [self.log_file + ".missing"], PARAMS_1
+        )
+
+    def test_key_depends_on_params(self):
+        """Return different keys for different query parameters."""
+        key_1 = ResultCache.make_key([self.log_file], PARAMS_1)
+        params_2 = {"charm": "juju.cmd", "format": "text"}
+        key_2 = ResultCache.make_key([self.log_file], params_2)
+        self.assertEqual(key_1, ResultCache.make_key([self.log_file], PARAMS_1))
+        self.assertNotEqual(key_1, key_2)
+
+    def test_key_depends_on_content(self):
+        """Return a different key after the log file is modified."""
+        key_1 = ResultCache.make_key([self.log_file], PARAMS_1)
+        with open(self.log_file, mode="a") as file:
+            file.write("machine-0: 01:56:57 INFO juju.cmd stopped\n")
+
+        self.assertNotEqual(key_1, ResultCache.make_key([self.log_file], PARAMS_1))
+
+    def test_key_depends_on_files(self):
+        """Return different keys for different sets of log files."""
+        other_file = os.path.join(self.tmp_dir.name, "machine-0.log")
+        with open(other_file, mode="w") as file:
+            file.write(LOG_FILE_1)
+
+        key_1 = ResultCache.make_key([self.log_file], PARAMS_1)
+        key_2 = ResultCache.make_key([self.log_file, other_file], PARAMS_1)
+        self.assertNotEqual(key_1, key_2)
+
+    def test_key_depends_on_version(self):
+        """Return a different key for a different version of the cache."""
+        key_1 = ResultCache.make_key([self.log_file], PARAMS_1)
+        with patch("result_cache.CACHE_VERSION", -1):
+            self.assertNotEqual(key_1, ResultCache.make_key([self.log_file], PARAMS_1))
+
+    def test_miss(self):
+        """Return None on a missing entry."""
+        result_cache = ResultCache(self.cache_dir)
+        self.assertIsNone(result_cache.get("missing"))
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self.assertEqual(result_cache.get_counters()["misses"], 1)
+
+    def test_hit(self):
+        """Return the stored statistics on a hit."""
+        log_parser = new_log_parser()
+        result_cache = ResultCache(self.cache_dir)
+        key = ResultCache.make_key([self.log_file], PARAMS_1)
+        result_cache.put(key, log_parser)
+
+        result = result_cache.get(key)
+
+        self.assertDictEqual(result.to_dict(), log_parser.to_dict())
+        self.assertEqual(str(result), str(log_parser))
+        self.assertEqual(result_cache.get_counters()["hits"], 1)
+        self.assertEqual(result_cache.get_counters()["stores"], 1)
+
+    def test_corrupted_entry(self):
+        """Return None on a corrupted entry."""
+        result_cache = ResultCache(self.cache_dir)
+        result_cache.put("key", new_log_parser())
+
+        with open(os.path.join(self.cache_dir, "key.entry"), mode="wb") as file:
+            file.write(b"corrupted")
+
+        self.assertIsNone(result_cache.get("key"))
+
+    def test_lru_eviction(self):
+        """Evict the least recently used entries when the cache is full."""
+        result_cache = ResultCache(self.cache_dir)
+        result_cache.put("key-1", new_log_parser())
+        entry_size = os.path.getsize(os.path.join(self.cache_dir, "key-1.entry"))
+        result_cache.max_size = 2 * entry_size
+
+        result_cache.put("key-2", new_log_parser())
+        os.utime(os.path.join(self.cache_dir, "key-1.entry"), ns=(0, 0))
+        os.utime(os.path.join(self.cache_dir, "key-2.entry"), ns=(1, 1))
+        result_cache.get("key-1")  # key-2 becomes the least recently used
+        result_cache.put("key-3", new_log_parser())
+
+        self.assertIsNotNone(result_cache.get("key-1"))
+        self.assertIsNone(result_cache.get("key-2"))
+        self.assertIsNotNone(result_cache.get("key-3"))
+        self.assertEqual(result_cache.get_counters()["evictions"], 1)
+
+    def test_save_counters(self):
+        """Accumulate the counters of several ResultCache objects."""
+        for _ in range(2):
+            result_cache = ResultCache(self.cache_dir)
+            result_cache.get("missing")
+            result_cache.put("key", new_log_parser())
+            result_cache.get("key")
+            result_cache.save_counters()
+
+        expected = {"hits": 2, "misses": 2, "stores": 2, "evictions": 0}
+        self.assertDictEqual(ResultCache(self.cache_dir).load_counters(), expected)
+
+    def test_save_counters_concurrently(self):
+        """Keep the updates of ResultCache objects saving their counters at once."""
+
+        def save_misses():
+            for _ in range(20):
+                result_cache = ResultCache(self.cache_dir)
+                result_cache.get("missing")
+                result_cache.save_counters()
+
+        threads = [Thread(target=save_misses) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(ResultCache(self.cache_dir).load_counters()["misses"], 80)
+
+
+if __name__ == "__main__":
+    main()
+
+__all__ = ["ResultCacheTester", "SampleHashTester"]
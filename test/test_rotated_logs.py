@@ -0,0 +1,239 @@
+"""This file contains the implementation of tester classes for rotated_logs.py."""
+
+import gzip
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from rotated_logs import (
+    discover_rotated_logs,
+    merged_log_reader,
+    open_log,
+    prefetched,
+    sequential_lines,
+    timestamped_logs,
+)
+
+# Constants
+DEFAULT_LOG_LINE_FORMAT = (
+    "{unit}: {hour}:{minutes}:{seconds} {severity_level} {charm_name} {message}\n"
+)
+
+BACKUP_LOG = """machine-0: 23:59:58 INFO juju.cmd first
+machine-0: 23:59:59 INFO juju.cmd second
+"""
+
+CURRENT_LOG = """machine-0: 23:59:59 INFO juju.cmd second
+machine-0: 00:00:01 INFO juju.cmd third
+machine-0: 00:00:01 INFO juju.cmd third
+"""
+
+AGGREGATED_LOG = """machine-0: 23:59:58 INFO juju.cmd first
+machine-1: 23:59:59 DEBUG juju.api other
+machine-0: 00:00:01 INFO juju.cmd third
+"""
+
+
+# Auxiliary Function
+def write_file(path: str, content: str):
+    with open(path, mode="w") as file:
+        file.write(content)
+
+
+def messages(logs):
+    return [log["message"] for log in logs]
+
+
+class DiscoverRotatedLogsTester(TestCase):
+    """Tester class used for testing the discover_rotated_logs function."""
+
+    def test_missing_file(self):
+        """Raise FileNotFoundError when the log file does not exist."""
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "machine-0.log")
+            self.assertRaises(FileNotFoundError, discover_rotated_logs, path)
+
+    def test_no_backups(self):
+        """Return only the log file when there are no backups."""
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "machine-0.log")
+            write_file(path, "")
+            write_file(os.path.join(tmp_dir, "machine-1.log"), "")
+            write_file(os.path.join(tmp_dir, "machine-0.log.bak"), "")
+
+            self.assertListEqual(discover_rotated_logs(path), [path])
+
+    def test_timestamped_backups(self):
+        """Return the backups named by lumberjack from the oldest to the newest."""
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "machine-0.log")
+            names = [
+                "machine-0-2022-08-30T10-15-00.000.log.gz",
+                "machine-0-2022-08-29T10-15-00.000.log",
+            ]
+            for name in names + ["machine-0.log"]:
+                write_file(os.path.join(tmp_dir, name), "")
+
+            expected = [os.path.join(tmp_dir, name) for name in reversed(names)]
+            self.assertListEqual(discover_rotated_logs(path), expected + [path])
+
+    def test_numbered_backups(self):
+        """Return the backups named by logrotate from the oldest to the newest."""
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "machine-0.log")
+            names = ["machine-0.log.1", "machine-0.log.10.gz", "machine-0.log.2.gz"]
+            for name in names + ["machine-0.log"]:
+                write_file(os.path.join(tmp_dir, name), "")
+
+            expected = [
+                os.path.join(tmp_dir, name)
+                for name in (
+                    "machine-0.log.10.gz",
+                    "machine-0.log.2.gz",
+                    "machine-0.log.1",
+                )
+            ]
+            self.assertListEqual(discover_rotated_logs(path), expected + [path])
+
+
+class OpenLogTester(TestCase):
+    """Tester class used for testing the open_log function."""
+
+    def test_compressed_file(self):
+        """Read the lines of a compressed log file."""
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "machine-0.log.1.gz")
+            with gzip.open(path, mode="wt") as file:
+                file.write(BACKUP_LOG)
+
+            with open_log(path) as file:
+                self.assertEqual(file.read(), BACKUP_LOG)
+
+
+class PrefetchedTester(TestCase):
+    """Tester class used for testing the prefetched function."""
+
+    def test_order(self):
+        """Produce every item in order."""
+        items = list(range(100))
+        result = list(prefetched(iter(items), chunk_size=7, depth=2))
+        self.assertListEqual(result, items)
+
+    def test_empty(self):
+        """Produce nothing from an empty iterable."""
+        self.assertListEqual(list(prefetched([])), [])
+
+    def test_exception(self):
+        """Raise the exceptions raised while consuming the iterable."""
+
+        def failing():
+            yield 1
+            raise ValueError("failed")
+
+        result = prefetched(failing(), chunk_size=1)
+        self.assertEqual(next(result), 1)
+        self.assertRaises(ValueError, next, result)
+
+
+class SequentialLinesTester(TestCase):
+    """Tester class used for testing the sequential_lines function."""
+
+    def test_order(self):
+        """Produce every line of each file, including the repeated ones."""
+        with TemporaryDirectory() as tmp_dir:
+            backup_log = os.path.join(tmp_dir, "machine-0.log.1")
+            current_log = os.path.join(tmp_dir, "machine-0.log")
+            write_file(backup_log, BACKUP_LOG)
+            write_file(current_log, CURRENT_LOG)
+
+            result = list(sequential_lines([backup_log, current_log]))
+            self.assertListEqual(result, (BACKUP_LOG + CURRENT_LOG).splitlines(True))
+
+
+class TimestampedLogsTester(TestCase):
+    """Tester class used for testing the timestamped_logs function."""
+
+    def test_day_rollover(self):
+        """Increase the timestamps after midnight and ignore invalid lines."""
+        lines = (BACKUP_LOG + "invalid line\n" + CURRENT_LOG).splitlines(True)
+        result = [t for t, _ in timestamped_logs(lines, DEFAULT_LOG_LINE_FORMAT)]
+        self.assertListEqual(result, [86398, 86399, 86399, 86401, 86401])
+
+
+class MergedLogReaderTester(TestCase):
+    """Tester class used for testing the merged_log_reader function."""
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.backup_log = os.path.join(self.tmp_dir.name, "machine-0.log.1")
+        self.current_log = os.path.join(self.tmp_dir.name, "machine-0.log")
+        self.aggregated_log = os.path.join(self.tmp_dir.name, "all-machines.log")
+        write_file(self.backup_log, BACKUP_LOG)
+        write_file(self.current_log, CURRENT_LOG)
+        write_file(self.aggregated_log, AGGREGATED_LOG)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_missing_file(self):
+        """Raise FileNotFoundError when some log file does not exist."""
+        log_sets = [[self.current_log + ".missing"]]
+        self.assertRaises(
+            FileNotFoundError, merged_log_reader, log_sets, DEFAULT_LOG_LINE_FORMAT
+        )
+
+    def test_single_set(self):
+        """Keep the entries repeated inside the same set, even across its files."""
+        log_sets = [[self.backup_log, self.current_log]]
+        result = merged_log_reader(log_sets, DEFAULT_LOG_LINE_FORMAT)
+        expected = ["first", "second", "second", "third", "third"]
+        self.assertListEqual(messages(result), expected)
+
+    def test_overlapping_sets(self):
+        """Drop the copies of the entries found in other sets."""
+        log_sets = [[self.backup_log, self.current_log], [self.aggregated_log]]
+
+        for prefetch in (True, False):
+            result = merged_log_reader(
+                log_sets, DEFAULT_LOG_LINE_FORMAT, prefetch=prefetch
+            )
+            expected = ["first", "second", "second", "other", "third", "third"]
+            self.assertListEqual(messages(result), expected)
+
+    def test_sets_starting_on_different_days(self):
+        """Align a set that starts after midnight with a set that starts before it."""
+        write_file(
+            self.current_log,
+            "machine-0: 00:00:01 INFO juju.cmd third\n"
+            "machine-0: 00:00:02 INFO juju.cmd fourth\n",
+        )
+        write_file(
+            self.aggregated_log,
+            "machine-0: 00:00:01 INFO juju.cmd third\n"
+            "machine-1: 00:00:03 DEBUG juju.api other\n",
+        )
+        log_sets = [[self.backup_log, self.current_log], [self.aggregated_log]]
+        expected = ["first", "second", "third", "fourth", "other"]
+
+        for sets in (log_sets, log_sets[::-1]):
+            result = merged_log_reader(sets, DEFAULT_LOG_LINE_FORMAT, prefetch=False)
+            self.assertListEqual(messages(result), expected)
+
+    def test_selected_charm(self):
+        """Produce only the entries of the selected charm."""
+        log_sets = [[self.current_log], [self.aggregated_log]]
+        result = merged_log_reader(log_sets, DEFAULT_LOG_LINE_FORMAT, "juju.api")
+        self.assertListEqual(messages(result), ["other"])
+
+
+if __name__ == "__main__":
+    main()
+
+__all__ = [
+    "DiscoverRotatedLogsTester",
+    "MergedLogReaderTester",
+    "OpenLogTester",
+    "PrefetchedTester",
+    "SequentialLinesTester",
+    "TimestampedLogsTester",
+]
@@ -0,0 +1,245 @@
+"""This file contains the implementation of tester classes for stats_server.py."""
+
+import json
+import os
+from io import StringIO
+from tempfile import TemporaryDirectory
+from time import monotonic, sleep
+from unittest import TestCase, main
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from log_parser import LogParser
+from stats_server import (
+    REJECTED_UNKNOWN_SEVERITY,
+    LogFollower,
+    SnapshotPublisher,
+    StatsDaemon,
+)
+
+# Constants
+DEFAULT_LOG_LINE_FORMAT = (
+    "{unit}: {hour}:{minutes}:{seconds} {severity_level} {charm_name} {message}\n"
+)
+
+LOG_LINE_0 = "controller-0: 01:47:48 INFO juju.worker.logger logger worker started\n"
+
+LOG_LINE_1 = "machine-0: 01:56:55 INFO juju.cmd running jujud\n"
+
+LOG_LINE_TRACE = "machine-0: 01:56:56 TRACE juju.cmd tracing\n"
+
+TIMEOUT = 5.0  # seconds
+
+
+# Auxiliary Function
+def append(path: str, content: str):
+    with open(path, mode="a") as file:
+        file.write(content)
+
+
+class LogFollowerTester(TestCase):
+    """Tester class used for testing the LogFollower class."""
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp_dir.name, "machine-0.log")
+        self.follower = LogFollower(self.log_file)
+
+    def tearDown(self):
+        self.follower.close()
+        self.tmp_dir.cleanup()
+
+    def test_missing_file(self):
+        """Read nothing until the log file is created."""
+        self.assertListEqual(self.follower.read_lines(), [])
+
+        append(self.log_file, LOG_LINE_0)
+        self.assertListEqual(self.follower.read_lines(), [LOG_LINE_0])
+
+    def test_appended_lines(self):
+        """Read only the lines appended since the last call."""
+        append(self.log_file, LOG_LINE_0)
+        self.assertListEqual(self.follower.read_lines(), [LOG_LINE_0])
+        self.assertListEqual(self.follower.read_lines(), [])
+
+        append(self.log_file, LOG_LINE_1)
+        self.assertListEqual(self.follower.read_lines(), [LOG_LINE_1])
+
+    def test_max_lines(self):
+        """Read at most the given number of lines."""
+        append(self.log_file, LOG_LINE_0 + LOG_LINE_1)
+        self.assertListEqual(self.follower.read_lines(1), [LOG_LINE_0])
+        self.assertListEqual(self.follower.read_lines(1), [LOG_LINE_1])
+
+    def test_partial_line(self):
+        """Wait for the rest of an incomplete line."""
+        append(self.log_file, LOG_LINE_0[:10])
+        self.assertListEqual(self.follower.read_lines(), [])
+
+        append(self.log_file, LOG_LINE_0[10:])
+        self.assertListEqual(self.follower.read_lines(), [LOG_LINE_0])
+
+    def test_partial_character(self):
+        """Wait for the rest of a multi-byte character split between writes."""
+        line = "machine-0: 01:56:57 INFO juju.cmd café\n".encode()
+        split = line.index("é".encode()) + 1
+
+        with open(self.log_file, mode="ab") as file:
+            file.write(line[:split])
+        self.assertListEqual(self.follower.read_lines(), [])
+
+        with open(self.log_file, mode="ab") as file:
+            file.write(line[split:])
+        self.assertListEqual(self.follower.read_lines(), [line.decode()])
+
+    def test_rotated_file(self):
+        """Read the rest of a rotated file and then the new file."""
+        append(self.log_file, LOG_LINE_0)
+        self.follower.read_lines()
+
+        append(self.log_file, LOG_LINE_0)
+        os.rename(self.log_file, self.log_file + ".1")
+        append(self.log_file, LOG_LINE_1)
+
+        self.assertListEqual(self.follower.read_lines(), [LOG_LINE_0])
+        self.assertListEqual(self.follower.read_lines(), [LOG_LINE_1])
+
+    def test_truncated_file(self):
+        """Read a truncated file from the beginning."""
+        append(self.log_file, LOG_LINE_0 + LOG_LINE_0)
+        self.follower.read_lines()
+
+        with open(self.log_file, mode="w") as file:
+            file.write(LOG_LINE_1)
+
+        self.assertListEqual(self.follower.read_lines(), [LOG_LINE_1])
+
+
+class SnapshotPublisherTester(TestCase):
+    """Tester class used for testing the SnapshotPublisher class."""
+
+    def test_empty_snapshot(self):
+        """Hold empty statistics before the first publication."""
+        publisher = SnapshotPublisher()
+        self.assertDictEqual(publisher.get_snapshot().to_dict(), LogParser().to_dict())
+
+    def test_snapshot_isolation(self):
+        """Keep published snapshots unchanged by further processing."""
+        log = {"charm_name": "juju.cmd", "severity_level": "INFO", "message": "up"}
+        log_parser = LogParser()
+        log_parser.process_log(log)
+
+        publisher = SnapshotPublisher()
+        publisher.publish(log_parser)
+        snapshot = publisher.get_snapshot()
+
+        log_parser.process_log(log)
+
+        self.assertEqual(snapshot.get_global_stats()["all"]["INFO"], 1)
+        self.assertEqual(snapshot.get_stats_for_charm("juju.cmd")["all"]["INFO"], 1)
+
+
+class StatsDaemonTester(TestCase):
+    """Tester class used for testing the StatsDaemon class over localhost."""
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp_dir.name, "machine-0.log")
+        append(self.log_file, LOG_LINE_0 + LOG_LINE_1)
+
+        self.daemon = StatsDaemon(
+            [self.log_file],
+            DEFAULT_LOG_LINE_FORMAT,
+            port=0,
+            poll_interval=0.01,
+            publish_interval=0.01,
+        )
+        self.daemon.start()
+        host, port = self.daemon.get_server_address()
+        self.url = f"http://{host}:{port}"
+
+    def tearDown(self):
+        self.daemon.stop()
+        self.tmp_dir.cleanup()
+
+    def get(self, path: str) -> str:
+        with urlopen(self.url + path, timeout=TIMEOUT) as response:
+            return response.read().decode()
+
+    def wait_for_total(self, total: int) -> dict:
+        deadline = monotonic() + TIMEOUT
+        while True:
+            stats = json.loads(self.get("/stats"))
+            if sum(stats["global"]["all"].values()) == total or monotonic() > deadline:
+                return stats
+            sleep(0.01)
+
+    def test_stats(self):
+        """Serve the statistics as JSON, including lines appended later."""
+        stats = self.wait_for_total(2)
+        self.assertListEqual(
+            list(stats["per_charm"]), ["juju.worker.logger", "juju.cmd"]
+        )
+
+        append(self.log_file, LOG_LINE_1)
+        stats = self.wait_for_total(3)
+        self.assertEqual(stats["per_charm"]["juju.cmd"]["duplicates"]["INFO"], 1)
+
+    def test_metrics(self):
+        """Serve the statistics in the Prometheus text format."""
+        self.wait_for_total(2)
+        metrics = self.get("/metrics")
+        self.assertIn('juju_log_messages_total{severity="INFO"} 2\n', metrics)
+
+    def test_not_found(self):
+        """Reply 404 to unknown paths."""
+        with self.assertRaises(HTTPError) as context:
+            self.get("/unknown")
+        self.assertEqual(context.exception.code, 404)
+
+    def test_unknown_severity(self):
+        """Reject the log records with an unknown severity and keep ingesting."""
+        self.wait_for_total(2)
+        append(self.log_file, LOG_LINE_TRACE + LOG_LINE_1)
+
+        stats = self.wait_for_total(3)
+        self.assertEqual(sum(stats["global"]["all"].values()), 3)
+        self.assertDictEqual(self.daemon.get_rejected(), {REJECTED_UNKNOWN_SEVERITY: 1})
+        self.assertDictEqual(self.daemon.get_errors(), {})
+
+    def test_ingestion_error(self):
+        """Count the errors raised while ingesting and keep ingesting."""
+        self.wait_for_total(2)
+        follower = self.daemon.followers[0]
+        error = UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+        with patch("sys.stderr", new_callable=StringIO) as mock_err:
+            with patch.object(follower, "read_lines", side_effect=error):
+                deadline = monotonic() + TIMEOUT
+                while not self.daemon.get_errors() and monotonic() < deadline:
+                    sleep(0.01)
+            self.assertIn("Failed to ingest", mock_err.getvalue())
+
+        self.assertGreater(self.daemon.get_errors()["UnicodeDecodeError"], 0)
+        append(self.log_file, LOG_LINE_1)
+        stats = self.wait_for_total(3)
+        self.assertEqual(sum(stats["global"]["all"].values()), 3)
+
+    def test_invalid_bytes(self):
+        """Replace the bytes that cannot be decoded."""
+        with open(self.log_file, mode="ab") as file:
+            file.write(b"machine-0: 01:56:57 INFO juju.cmd \xff\n")
+
+        stats = self.wait_for_total(3)
+        self.assertEqual(sum(stats["global"]["all"].values()), 3)
+
+    def test_wait(self):
+        """Wait until the daemon is stopped."""
+        self.assertFalse(self.daemon.wait(0.01))
+
+
+if __name__ == "__main__":
+    main()
+
+__all__ = ["LogFollowerTester", "SnapshotPublisherTester", "StatsDaemonTester"]
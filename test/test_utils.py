@@ -2,7 +2,7 @@
 
 from unittest import TestCase, main
 
-from utils import unformat
+from utils import compile_unformat, leading_field_separator, unformat
 
 # Constants
 DEFAULT_LOG_LINE_FORMAT = (
@@ -72,7 +72,113 @@ class UnformatTester(TestCase):
         self.assertDictEqual(result, expected)
 
 
+class CompileUnformatTester(TestCase):
+    """Tester class used for testing the compile_unformat utility function."""
+
+    def test_none_pattern_exception(self):
+        """Raise TypeError when the pattern parameter is None."""
+        self.assertRaises(TypeError, compile_unformat, None, ["name"])
+
+    def test_none_fields_exception(self):
+        """Raise TypeError when the fields parameter is None."""
+        self.assertRaises(TypeError, compile_unformat, TEST_PATTERN_1, None)
+
+    def test_empty_fields_exception(self):
+        """Raise ValueError when the fields parameter is empty."""
+        self.assertRaises(ValueError, compile_unformat, TEST_PATTERN_1, [])
+
+    def test_unknown_field_exception(self):
+        """Raise ValueError when a field is not in the pattern."""
+        self.assertRaises(ValueError, compile_unformat, TEST_PATTERN_1, ["city"])
+
+    def test_format_spec_exception(self):
+        """Raise ValueError when the pattern has a field with a format spec."""
+        self.assertRaises(ValueError, compile_unformat, "I'm {age:d}", ["age"])
+
+    def test_repeated_field_exception(self):
+        """Raise ValueError when the pattern has a repeated field."""
+        self.assertRaises(ValueError, compile_unformat, "{name} {name}", ["name"])
+
+    def test_selected_fields(self):
+        """Return the values of the selected fields in order."""
+        result = compile_unformat(TEST_PATTERN_1, ["age", "name"])(TEST_STR_1)
+        self.assertTupleEqual(result, ("25", "John"))
+
+    def test_single_field(self):
+        """Return a tuple with the value of a single selected field."""
+        result = compile_unformat(TEST_PATTERN_1, ["name"])(TEST_STR_1)
+        self.assertTupleEqual(result, ("John",))
+
+    def test_no_match(self):
+        """Return None when there is not a match between the string and the pattern."""
+        result = compile_unformat(TEST_PATTERN_1, ["name"])("Hello, John!")
+        self.assertIsNone(result)
+
+    def test_same_as_unformat(self):
+        """Match the same log lines as unformat."""
+        fields = ["charm_name", "severity_level", "message"]
+        unformat_fields = compile_unformat(DEFAULT_LOG_LINE_FORMAT, fields)
+        lines = [
+            "machine-0: 01:56:55 INFO juju.cmd running jujud [2.8.1 0 gc go1.14.4]\n",
+            "machine-0: 01:56:55 INFO juju.cmd missing newline",
+            "machine-0: 01:56:55 INFO juju.cmd\n",
+            "a: b: 01:02:03 DEBUG juju.cmd unit with colon\n",
+            "x: 1:2:3:4 ERROR juju.api multi\nline\n",
+            "    goroutine 1 [running]:\n",
+            "\n",
+        ]
+
+        for line in lines:
+            log = unformat(line, DEFAULT_LOG_LINE_FORMAT)
+            expected = None if log is None else tuple(log[field] for field in fields)
+            self.assertEqual(unformat_fields(line), expected)
+
+
+class LeadingFieldSeparatorTester(TestCase):
+    """Tester class used for testing the leading_field_separator function."""
+
+    def test_none_exception(self):
+        """Raise TypeError when the pattern parameter is None."""
+        self.assertRaises(TypeError, leading_field_separator, None)
+
+    def test_default_format(self):
+        """Return the literal that follows the unit in the default format."""
+        self.assertEqual(leading_field_separator(DEFAULT_LOG_LINE_FORMAT), ": ")
+
+    def test_leading_literal(self):
+        """Return None when the pattern does not start with a field."""
+        self.assertIsNone(leading_field_separator(TEST_PATTERN_1))
+
+    def test_no_separator(self):
+        """Return None when the first field is not followed by a literal."""
+        self.assertIsNone(leading_field_separator("{unit}{message}"))
+        self.assertIsNone(leading_field_separator("{unit}"))
+
+    def test_cased_separator(self):
+        """Return None when the literal would be matched ignoring case."""
+        self.assertIsNone(leading_field_separator("{unit} at {message}"))
+
+    def test_matching_lines(self):
+        """Return a literal found after the first character of every matching line."""
+        separator = leading_field_separator(DEFAULT_LOG_LINE_FORMAT)
+        lines = [
+            "a: b: 01:02:03 DEBUG juju.cmd unit with colon\n",
+            "unit 0: 01:02:03 DEBUG juju.cmd unit with space\n",
+            "  machine-0: 01:02:03 DEBUG juju.cmd leading whitespace\n",
+        ]
+        for line in lines:
+            self.assertIsNotNone(unformat(line, DEFAULT_LOG_LINE_FORMAT))
+            self.assertGreaterEqual(line.find(separator, 1), 1)
+
+
 if __name__ == "__main__":
     main()
 
-__all__ = ["DEFAULT_LOG_LINE_FORMAT", "TEST_PATTERN_1", "TEST_STR_1", "UnformatTester"]
+__all__ = [
+    "CompileUnformatTester",
+    "DEFAULT_LOG_LINE_FORMAT",
+    "LeadingFieldSeparatorTester",
+    "TEST_PATTERN_1",
+    "TEST_STR_1",
+    "UnformatTester",
+]